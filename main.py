@@ -2884,6 +2884,7 @@ def render_pantry_management(db, pantry_service, user_id, all_ingredients, curre
                                     cursor.execute("DELETE FROM user_pantry WHERE user_id = ? AND ingredient_id = ?", 
                                                  (user_id, ingredient.id))
                                     conn.commit()
+                                pantry_service.invalidate_pantry_cache(user_id)
                                 st.success(f"Removed {ingredient.name} from pantry")
                                 st.rerun()
                             except Exception as e:
@@ -9,6 +9,8 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Set, Dict, Any
 from datetime import datetime
 
+from utils.json_utils import json_dumps, json_loads, JSONDecodeError
+
 
 @dataclass
 class NutritionData:
@@ -20,6 +22,26 @@ class NutritionData:
     fiber_grams: Optional[float] = None
     sodium_milligrams: Optional[float] = None
     sugar_grams: Optional[float] = None
+    
+    @classmethod
+    def from_json(cls, json_str: str) -> Optional['NutritionData']:
+        """Deserialize nutrition data from database, or None if it isn't a JSON object"""
+        try:
+            data = json_loads(json_str)
+        except (JSONDecodeError, TypeError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        get = data.get
+        return cls(
+            get('calories'),
+            get('protein_grams'),
+            get('carbs_grams'),
+            get('fat_grams'),
+            get('fiber_grams'),
+            get('sodium_milligrams'),
+            get('sugar_grams')
+        )
 
 
 @dataclass
@@ -40,6 +62,25 @@ class Ingredient:
         """Ensure common_substitutes is a list"""
         if isinstance(self.common_substitutes, str):
             self.common_substitutes = [sub.strip() for sub in self.common_substitutes.split(',') if sub.strip()]
+    
+    @staticmethod
+    def substitutes_to_db(substitutes) -> str:
+        """Serialize substitutes for database storage as a JSON array"""
+        if isinstance(substitutes, str):
+            substitutes = substitutes.split(',')
+        return json_dumps([sub.strip() for sub in substitutes if sub and sub.strip()])
+    
+    @staticmethod
+    def substitutes_from_db(value: Optional[str]) -> List[str]:
+        """Deserialize substitutes stored as a JSON array, or as legacy comma-separated text"""
+        if not value:
+            return []
+        if value[0] == '[':
+            try:
+                return json_loads(value)
+            except JSONDecodeError:
+                pass
+        return [sub.strip() for sub in value.split(',') if sub.strip()]
 
 
 @dataclass
@@ -8,7 +8,8 @@ Designed for multi-user web deployment with secure credential management.
 from dataclasses import dataclass, field
 from typing import Dict, Set, List, Optional, Any
 from datetime import datetime
-import json
+
+from utils.json_utils import json_dumps, json_loads, JSONDecodeError
 
 
 @dataclass 
@@ -24,7 +25,7 @@ class UserPreferences:
     
     def to_json(self) -> str:
         """Serialize preferences for database storage"""
-        return json.dumps({
+        return json_dumps({
             'preferred_units': self.preferred_units,
             'dietary_restrictions': self.dietary_restrictions,
             'preferred_cuisines': self.preferred_cuisines,
@@ -38,9 +39,9 @@ class UserPreferences:
     def from_json(cls, json_str: str) -> 'UserPreferences':
         """Deserialize preferences from database"""
         try:
-            data = json.loads(json_str)
+            data = json_loads(json_str)
             return cls(**data)
-        except (json.JSONDecodeError, TypeError):
+        except (JSONDecodeError, TypeError):
             return cls()  # Return defaults if parsing fails
 
 
@@ -6,6 +6,7 @@ Tests recipe CRUD operations and ingredient filtering.
 
 import sys
 import os
+import sqlite3
 from pathlib import Path
 
 # Add the project root to the path
@@ -129,10 +130,98 @@ def test_database_service():
     print("\n[SUCCESS] All database tests passed!")
     return True
 
+def test_read_cache_invalidation():
+    """Test that cached reads are dropped by the matching writes"""
+    print("Testing read cache invalidation...")
+    
+    from services.ingredient_service import IngredientService
+    
+    db = DatabaseService(":memory:")
+    ingredient_service = IngredientService(db)
+    
+    basil = db.create_ingredient("Sweet Basil", "herb")
+    assert basil is not None, "Failed to create ingredient"
+    
+    # Repeat reads are served from the cache as independent copies
+    hits = db._ingredient_cache.hits
+    first = db.get_ingredient_by_id(basil.id)
+    second = db.get_ingredient_by_id(basil.id)
+    assert first == second and first is not second
+    assert db._ingredient_cache.hits == hits + 2
+    
+    # Mutating a returned object does not leak into the cache
+    first.common_substitutes.append("oregano")
+    assert "oregano" not in db.get_ingredient_by_id(basil.id).common_substitutes
+    assert len(db.get_all_ingredients()) == 1
+    
+    # Creating an ingredient invalidates the cached list
+    db.create_ingredient("Thyme", "herb")
+    assert len(db.get_all_ingredients()) == 2
+    
+    # Raw SQL writes in the ingredient service invalidate the by-id cache
+    ingredient_service.update_ingredient(basil.id, category="seasoning")
+    assert db.get_ingredient_by_id(basil.id).category == "seasoning"
+    
+    print("[OK] Read caches invalidated on write")
+    return True
+
+def test_abandoned_stream_releases_connection():
+    """Test that stopping a streaming read early leaves no connection block open"""
+    print("Testing abandoned streaming reads...")
+    
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(os.path.join(tmp, "stream.db"))
+        for name in ("Anise", "Basil", "Cumin"):
+            db.create_ingredient(name, "spice")
+        
+        stream = db.iter_all_ingredients()
+        assert next(stream).name == "Anise"
+        # Between pages no block is entered, even with the iterator suspended
+        assert getattr(db._local, 'depth', 0) == 0
+        stream.close()
+        
+        assert [ing.name for ing in db.get_all_ingredients()] == ["Anise", "Basil", "Cumin"]
+        
+        # A worker thread gets its own connection, which close() must release too
+        import threading
+        worker = threading.Thread(target=db.get_database_stats)
+        worker.start()
+        worker.join()
+        opened = list(db._connections)
+        assert len(opened) == 2
+        db.close()
+        assert db._connections == []
+        for conn in opened:
+            try:
+                conn.execute("SELECT 1")
+                assert False, "Connection left open after close()"
+            except sqlite3.ProgrammingError:
+                pass
+    
+    print("[OK] Abandoned stream released its connection")
+    return True
+
+def test_services_are_collectable():
+    """Test that shutdown registration does not keep discarded services alive"""
+    print("Testing service lifetime...")
+    
+    import gc
+    import weakref
+    
+    ref = weakref.ref(DatabaseService(":memory:"))
+    gc.collect()
+    assert ref() is None, "Discarded service was kept alive"
+    
+    print("[OK] Discarded service was collected")
+    return True
+
 if __name__ == "__main__":
     try:
-        success = test_database_service()
-        sys.exit(0 if success else 1)
+        results = [test_database_service(), test_read_cache_invalidation(),
+                   test_abandoned_stream_releases_connection(), test_services_are_collectable()]
+        sys.exit(0 if all(results) else 1)
     except Exception as e:
         print(f"[ERROR] Test failed with error: {e}")
         import traceback
@@ -131,6 +131,27 @@ def test_time_parsing():
     
     return True
 
+def test_title_cleaning():
+    """Test recipe site suffixes are stripped from titles"""
+    print("\n[TEST] Title cleaning:")
+    
+    parser = ParsingService(DatabaseService(":memory:"))
+    
+    test_titles = [
+        ("Best Chocolate Chip Cookies", "Best Chocolate Chip Cookies"),
+        ("  Easy   Pasta Recipe ", "Easy Pasta"),
+        ("Tacos | Food Network", "Tacos"),
+        ("Soup - allrecipes.com", "Soup"),
+        ("Chili Recipe - example.com", "Chili"),
+    ]
+    
+    for title, expected in test_titles:
+        result = parser._clean_title(title)
+        assert result == expected, f"'{title}' -> '{result}' (expected '{expected}')"
+        print(f"  [OK] '{title}' -> '{result}'")
+    
+    return True
+
 def test_ingredient_parsing():
     """Test ingredient parsing functionality"""
     print("\n[TEST] Ingredient parsing:")
@@ -154,6 +175,11 @@ def test_ingredient_parsing():
         print(f"    Name: {parsed['name']}, Prep: {parsed['preparation']}")
         print(f"    Optional: {parsed['optional']}")
     
+    # A preparation word inside a parenthetical is reported once, with the note
+    name, preparation = parser._parse_ingredient_name_and_prep("tomatoes (peeled, diced), chopped")
+    assert name == "tomatoes", name
+    assert preparation == "chopped, peeled, diced", preparation
+    
     return True
 
 def test_ingredient_matching():
@@ -195,8 +221,9 @@ if __name__ == "__main__":
         success2 = test_time_parsing()
         success3 = test_ingredient_parsing() 
         success4 = test_ingredient_matching()
+        success5 = test_title_cleaning()
         
-        if all([success1, success2, success3, success4]):
+        if all([success1, success2, success3, success4, success5]):
             print("\n[SUCCESS] All parsing tests passed!")
             sys.exit(0)
         else:
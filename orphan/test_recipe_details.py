@@ -177,6 +177,18 @@ def test_recipe_editing_functionality():
     
     print(f"[OK] Recipe changes saved successfully")
     
+    # Search filters on the tag lookup table, so edited tags must be found there
+    found = db.search_recipes("", user_id=1, filters={'dietary_tags': ["healthy"]})
+    assert [r.id for r in found] == [recipe_id], "Added dietary tag not searchable"
+    
+    updated_recipe.dietary_tags = ["vegan"]
+    assert details_interface._save_recipe_changes(updated_recipe), "Failed to save tag changes"
+    assert db.search_recipes("", user_id=1, filters={'dietary_tags': ["vegetarian"]}) == [], "Removed dietary tag still matches"
+    found = db.search_recipes("", user_id=1, filters={'dietary_tags': ["vegan"]})
+    assert [r.id for r in found] == [recipe_id], "Edited dietary tag not searchable"
+    
+    print(f"[OK] Edited dietary tags are searchable")
+    
     return True
 
 def test_dietary_filtering():
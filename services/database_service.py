@@ -6,39 +6,299 @@ and recipe data operations. Adapted from Herbalism app database patterns
 with enhancements for multi-user web deployment.
 """
 
+import copy
+import os
 import sqlite3
-import json
 import logging
+import time
 import threading
+import atexit
+import weakref
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional, Dict, Set, Tuple, Any
+from typing import List, Optional, Dict, Set, Tuple, Any, Iterator
 from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, timedelta
 
 from models import (
     Recipe, Ingredient, RecipeIngredient, User, UserPreferences, 
     Collection, UserSession, NutritionData
 )
+from utils.json_utils import json_dumps
 
 logger = logging.getLogger(__name__)
 
 
+def _adapt_datetime(value: datetime) -> str:
+    """Bind datetimes as 'YYYY-MM-DD HH:MM:SS', the same format CURRENT_TIMESTAMP uses"""
+    return value.isoformat(sep=' ', timespec='seconds')
+
+
+def _now_timestamp() -> str:
+    """Current time pre-formatted for binding, computed once per operation"""
+    return _adapt_datetime(datetime.now())
+
+
+# Bound once so row hydration loops skip the attribute lookup
+_fromisoformat = datetime.fromisoformat
+
+
+def _parse_timestamp(value) -> datetime:
+    """Parse a stored timestamp, passing through values the driver already converted"""
+    if isinstance(value, datetime):
+        return value
+    return _fromisoformat(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached_timestamp(value: str) -> datetime:
+    """Parse a stored timestamp, memoized since the same session/user values are read on every request"""
+    return _fromisoformat(value)
+
+
+# Shorter than the default microsecond format, and keeps string comparisons
+# against CURRENT_TIMESTAMP defaults consistent
+sqlite3.register_adapter(datetime, _adapt_datetime)
+
+# Queries opt in per column with an alias like `last_updated AS "last_updated [datetime]"`;
+# connections use PARSE_COLNAMES only, so unaliased TIMESTAMP columns stay strings
+sqlite3.register_converter("datetime", lambda value: _fromisoformat(value.decode()))
+
+
+# Value of PRAGMA user_version once SCHEMA_UPGRADES_SQL has been applied.
+# Bump it whenever that script changes so existing databases pick it up
+SCHEMA_UPGRADES_VERSION = 1
+
+# Idempotent schema additions applied on top of database_schema.sql, both for
+# new databases and for existing ones not yet at SCHEMA_UPGRADES_VERSION
+SCHEMA_UPGRADES_SQL = """
+-- Auth lookups filter on is_active = 1; keep only active users in the index
+CREATE INDEX IF NOT EXISTS idx_users_active_email ON users (email) WHERE is_active = 1;
+
+-- Session validation filters on token and expiry and joins on user_id; SQLite
+-- has no INCLUDE clause, so cover those columns through the index key order
+CREATE INDEX IF NOT EXISTS idx_sessions_token_expires ON user_sessions (session_token, expires_at, user_id);
+
+-- Ingredient merges and usage checks look up recipe_ingredients by ingredient
+-- and read recipe_id; cover both, which makes the single-column index redundant
+CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_ingredient_recipe ON recipe_ingredients (ingredient_id, recipe_id);
+DROP INDEX IF EXISTS idx_recipe_ingredients_ingredient;
+
+-- Pantry matching reads a user's available ingredient IDs; cover the lookup
+CREATE INDEX IF NOT EXISTS idx_user_pantry_user_available ON user_pantry (user_id, is_available, ingredient_id);
+
+-- Encrypted API keys, one row per user and service
+CREATE TABLE IF NOT EXISTS user_api_keys (
+    user_id INTEGER NOT NULL,
+    service TEXT NOT NULL,
+    encrypted_key TEXT NOT NULL,
+    PRIMARY KEY (user_id, service),
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Move keys out of the legacy users.api_keys JSON column, then clear it so
+-- removed keys are not copied back on the next start
+INSERT OR IGNORE INTO user_api_keys (user_id, service, encrypted_key)
+SELECT u.id, j.key, j.value
+FROM users u, json_each(CASE WHEN json_valid(u.api_keys) THEN u.api_keys ELSE '{}' END) j
+WHERE u.api_keys NOT IN ('', '{}');
+UPDATE users SET api_keys = '{}' WHERE api_keys NOT IN ('', '{}');
+
+-- Dietary tags, one row per recipe and tag, so filters match whole tags and
+-- can use an index instead of LIKE over the comma-separated column
+CREATE TABLE IF NOT EXISTS recipe_dietary_tags (
+    recipe_id INTEGER NOT NULL,
+    tag TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (recipe_id, tag),
+    FOREIGN KEY (recipe_id) REFERENCES recipes (id) ON DELETE CASCADE
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_recipe_dietary_tags_tag ON recipe_dietary_tags (tag, recipe_id);
+
+-- Foreign keys are not enforced on these connections, so clean up explicitly
+CREATE TRIGGER IF NOT EXISTS trg_recipes_delete_dietary_tags
+AFTER DELETE ON recipes
+BEGIN
+    DELETE FROM recipe_dietary_tags WHERE recipe_id = OLD.id;
+END;
+
+-- Split the legacy recipes.dietary_tags column for recipes not yet migrated
+WITH RECURSIVE split (recipe_id, tag, rest) AS (
+    SELECT r.id, '', r.dietary_tags || ','
+    FROM recipes r
+    WHERE r.dietary_tags != ''
+    AND NOT EXISTS (SELECT 1 FROM recipe_dietary_tags t WHERE t.recipe_id = r.id)
+    UNION ALL
+    SELECT recipe_id, trim(substr(rest, 1, instr(rest, ',') - 1)), substr(rest, instr(rest, ',') + 1)
+    FROM split
+    WHERE rest != ''
+)
+INSERT OR IGNORE INTO recipe_dietary_tags (recipe_id, tag)
+SELECT recipe_id, tag FROM split WHERE tag != '';
+"""
+
+
+# Set PANS_DB_TRACE=true to log every statement with its execution time
+DB_TRACE_ENABLED = os.getenv("PANS_DB_TRACE", "false").lower() == "true"
+
+# Rows per executemany call in bulk inserts, keeping each batch within the page cache
+BULK_INSERT_CHUNK_SIZE = 5000
+
+# Bound parameters per statement for IN (...) lookups (SQLite's historical default limit)
+SQLITE_MAX_PARAMS = 999
+
+# Rows fetched per page by the iter_* streaming reads
+STREAM_PAGE_SIZE = 500
+
+# Explicit ingredient column order for the positional (tuple) hydration path
+INGREDIENT_COLUMNS = "id, name, category, common_substitutes, storage_tips, nutritional_data, created_at"
+
+# Per-connection page cache (negative cache_size values are in KiB) and
+# memory-mapped I/O window for file databases
+PAGE_CACHE_KIB = 65536
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+# Prepared statements kept per connection; the hot lookups reuse a handful of
+# fixed SQL strings, so a larger cache avoids re-parsing them on every call
+STATEMENT_CACHE_SIZE = 256
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """Cursor that logs each statement with its execution time"""
+    
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.debug(f"SQL {elapsed_ms:.2f}ms: {' '.join(sql.split())}")
+    
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.debug(f"SQL {elapsed_ms:.2f}ms (many): {' '.join(sql.split())}")
+
+
+class _TimedConnection(sqlite3.Connection):
+    """Connection whose cursors time their statements"""
+    
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _trace_statement(statement: str):
+    """Trace callback logging statements as SQLite runs them, including triggers"""
+    logger.debug(f"SQL trace: {statement}")
+
+
+class _LRUCache:
+    """
+    Small thread-safe LRU mapping for hot lookups.
+    
+    Values are deep-copied on the way in and out, so callers can mutate the
+    models they get back without changing what other callers read.
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return copy.deepcopy(value)
+    
+    def put(self, key, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Services not yet closed, closed at interpreter exit. Held weakly so that
+# registering for shutdown does not keep every instance (and its caches) alive
+_open_services: 'weakref.WeakSet' = weakref.WeakSet()
+
+
+def _close_open_services():
+    """Close the services still alive at interpreter exit"""
+    for service in list(_open_services):
+        service.close()
+
+
+atexit.register(_close_open_services)
+
+
 class DatabaseService:
     """
     Centralized database service for all SQLite operations.
     Follows patterns from Herbalism app with multi-user enhancements.
     """
     
+    # How often buffered session activity touches are written back
+    SESSION_ACTIVITY_FLUSH_SECONDS = 10
+    
+    # Rows written through batch operations before planner statistics are refreshed
+    ANALYZE_ROW_THRESHOLD = 1000
+    
     def __init__(self, db_path: str = "pans_cookbook.db"):
         self.db_path = db_path
         # Look for schema file relative to the project root
         from pathlib import Path
         project_root = Path(__file__).parent.parent
         self.schema_path = project_root / "database_schema.sql"
-        # Thread-local storage for in-memory database connections
+        # Thread-local storage for database connections (one per thread)
         self._local = threading.local()
+        # Every connection handed to a thread, so close() can release them all
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._is_memory_db = db_path == ":memory:"
+        # Read-through caches for hot lookups, invalidated by the write methods
+        self._user_cache = _LRUCache(maxsize=1024)
+        self._ingredient_cache = _LRUCache(maxsize=1024)
+        self._recipe_cache = _LRUCache(maxsize=1024)
+        # Bumped on every ingredient write so the cached full list goes stale
+        self._ingredient_version = 0
+        # Holds column values rather than models, so each caller gets fresh objects
+        self._all_ingredients_cache: Optional[Tuple[int, List[tuple]]] = None
+        # Session activity touches are buffered and written back in batches
+        self._activity_dirty: Dict[str, datetime] = {}
+        self._activity_lock = threading.Lock()
+        self._activity_stop = threading.Event()
+        self._activity_thread: Optional[threading.Thread] = None
+        # Rows written by batch operations since the last ANALYZE
+        self._rows_since_analyze = 0
         self._ensure_database_exists()
+        _open_services.add(self)
     
     def _ensure_database_exists(self):
         """Initialize database if it doesn't exist"""
@@ -59,15 +319,46 @@ class DatabaseService:
                         if not cursor.fetchone():
                             logger.warning("Database file exists but missing tables, reinitializing...")
                             self.initialize_database()
+                        else:
+                            self._apply_schema_upgrades(conn)
                 except Exception as e:
                     logger.error(f"Error checking database tables: {e}")
                     self.initialize_database()
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a configured connection, with statement tracing when PANS_DB_TRACE is set"""
+        if DB_TRACE_ENABLED:
+            conn = sqlite3.connect(self.db_path, factory=_TimedConnection,
+                                   cached_statements=STATEMENT_CACHE_SIZE,
+                                   check_same_thread=False,
+                                   detect_types=sqlite3.PARSE_COLNAMES)
+            conn.set_trace_callback(_trace_statement)
+        else:
+            conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE,
+                                   check_same_thread=False,
+                                   detect_types=sqlite3.PARSE_COLNAMES)
+        conn.row_factory = sqlite3.Row  # Enable dict-like access
+        self._configure_connection(conn)
+        return conn
+    
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Apply per-connection performance settings"""
+        if not self._is_memory_db:
+            # WAL lets readers run alongside a writer; with it, NORMAL sync is
+            # still safe against corruption and skips the fsync on every commit
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+        conn.execute(f"PRAGMA cache_size=-{PAGE_CACHE_KIB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+    
     def _get_thread_connection(self):
-        """Get or create thread-local connection for in-memory databases"""
+        """Get or create the thread-local connection"""
         if not hasattr(self._local, 'connection') or self._local.connection is None:
-            self._local.connection = sqlite3.connect(self.db_path)
-            self._local.connection.row_factory = sqlite3.Row
+            self._local.connection = self._open_connection()
+            with self._connections_lock:
+                self._connections.append(self._local.connection)
+            self._reset_connection_depth()
             # Initialize schema for new thread-local connection
             if self._is_memory_db:
                 self._initialize_connection_schema(self._local.connection)
@@ -98,20 +389,11 @@ class DatabaseService:
                 with open(schema_file, 'r', encoding='utf-8') as f:
                     schema_sql = f.read()
                 
-                # Execute schema in chunks (split by ; and filter empty)
-                statements = [stmt.strip() for stmt in schema_sql.split(';') if stmt.strip()]
-                logger.debug(f"Executing {len(statements)} schema statements")
-                
-                for i, statement in enumerate(statements):
-                    try:
-                        conn.execute(statement)
-                        if i < 5:  # Log first few statements for debugging
-                            logger.debug(f"Executed statement {i}: {statement[:50]}...")
-                    except Exception as e:
-                        logger.warning(f"Failed to execute statement {i}: {e}")
-                        # Continue with other statements
-                
+                # Run the whole DDL script in one call; SQLite parses it natively,
+                # so semicolons inside strings or trigger bodies are handled correctly
+                conn.executescript(schema_sql)
                 conn.commit()
+                self._apply_schema_upgrades(conn)
                 
                 # Verify key tables exist
                 cursor = conn.cursor()
@@ -131,16 +413,57 @@ class DatabaseService:
             logger.error(f"Schema init traceback: {traceback.format_exc()}")
             raise
     
+    def _apply_schema_upgrades(self, conn) -> bool:
+        """Apply the schema additions once per database, returning True if they ran"""
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_UPGRADES_VERSION:
+            return False
+        
+        conn.executescript(SCHEMA_UPGRADES_SQL)
+        self._migrate_common_substitutes(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_UPGRADES_VERSION}")
+        # Let the planner see the new indexes
+        conn.execute("ANALYZE")
+        conn.commit()
+        logger.info(f"Applied schema upgrades (version {SCHEMA_UPGRADES_VERSION})")
+        return True
+    
+    def _migrate_common_substitutes(self, conn):
+        """Rewrite legacy comma-separated common_substitutes values as JSON arrays"""
+        rows = conn.execute("""
+            SELECT id, common_substitutes FROM ingredients
+            WHERE common_substitutes != '' AND common_substitutes NOT LIKE '[%'
+        """).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE ingredients SET common_substitutes = ? WHERE id = ?",
+                [(Ingredient.substitutes_to_db(row[1]), row[0]) for row in rows]
+            )
+            logger.info(f"Migrated common_substitutes to JSON for {len(rows)} ingredients")
+    
     def cleanup_thread_connection(self):
         """Clean up thread-local connection (call when thread ends)"""
-        if self._is_memory_db and hasattr(self._local, 'connection'):
+        if getattr(self._local, 'connection', None) is not None:
             try:
-                self._local.connection.close()
+                conn = self._local.connection
+                with self._connections_lock:
+                    if conn in self._connections:
+                        self._connections.remove(conn)
+                conn.close()
                 delattr(self._local, 'connection')
+                self._reset_connection_depth()
                 logger.debug("Thread-local database connection cleaned up")
             except Exception as e:
                 logger.warning(f"Error cleaning up thread connection: {e}")
 
+    def _reset_connection_depth(self):
+        """Start block nesting afresh for a new or discarded thread connection"""
+        if getattr(self._local, 'depth', 0):
+            # A block entered on the old connection never exited; its count
+            # would otherwise stop the outermost-exit rollback from ever firing
+            logger.warning(f"Discarding connection nesting depth {self._local.depth} for thread "
+                           f"{threading.current_thread().ident}")
+        self._local.depth = 0
+    
     @contextmanager
     def get_connection(self):
         """Context manager for database connections with proper cleanup"""
@@ -156,20 +479,54 @@ class DatabaseService:
                 logger.error(f"Database error: {e}")
                 raise
         else:
-            # Use regular connection for file databases
-            conn = None
+            # File databases also reuse one configured connection per thread
+            conn = self._get_thread_connection()
+            self._local.depth = getattr(self._local, 'depth', 0) + 1
             try:
-                conn = sqlite3.connect(self.db_path)
-                conn.row_factory = sqlite3.Row  # Enable dict-like access
                 yield conn
             except Exception as e:
-                if conn:
-                    conn.rollback()
+                conn.rollback()
                 logger.error(f"Database error: {e}")
                 raise
             finally:
-                if conn:
-                    conn.close()
+                # Depth belongs to the current connection; skip the bookkeeping
+                # if this one was discarded while the block was open
+                if getattr(self._local, 'connection', None) is conn:
+                    self._local.depth -= 1
+                    if self._local.depth == 0 and conn.in_transaction:
+                        # Uncommitted work is discarded when the outermost block
+                        # exits, as it was when each block closed its own connection
+                        conn.rollback()
+    
+    def invalidate_user_cache(self, user_id: Optional[int] = None):
+        """Drop cached users (all of them when no ID is given)"""
+        if user_id is None:
+            self._user_cache.clear()
+        else:
+            self._user_cache.pop(user_id)
+    
+    def invalidate_recipe_cache(self, recipe_id: Optional[int] = None):
+        """Drop cached recipes (all of them when no ID is given)"""
+        if recipe_id is None:
+            self._recipe_cache.clear()
+        else:
+            self._recipe_cache.pop((recipe_id, True))
+            self._recipe_cache.pop((recipe_id, False))
+    
+    def invalidate_ingredient_cache(self, ingredient_id: Optional[int] = None):
+        """Drop cached ingredients and the cached ingredient list"""
+        if ingredient_id is None:
+            self._ingredient_cache.clear()
+        else:
+            self._ingredient_cache.pop(ingredient_id)
+        self._ingredient_version += 1
+        self._all_ingredients_cache = None
+    
+    def invalidate_caches(self):
+        """Drop every cached read (use after raw SQL writes outside this service)"""
+        self.invalidate_user_cache()
+        self.invalidate_recipe_cache()
+        self.invalidate_ingredient_cache()
     
     def _ensure_schema_for_connection(self, conn):
         """Ensure schema exists for a connection"""
@@ -228,6 +585,7 @@ class DatabaseService:
                    first_name: str = "", last_name: str = "") -> Optional[User]:
         """Create a new user account"""
         try:
+            now = _now_timestamp()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
@@ -237,24 +595,28 @@ class DatabaseService:
                     logger.warning(f"User creation failed - email already exists: {email}")
                     return None
                 
-                # Create user
+                # Create user (RETURNING hands back the stored row, no re-fetch needed)
                 cursor.execute("""
                     INSERT INTO users (email, password_hash, username, first_name, last_name, created_at)
                     VALUES (?, ?, ?, ?, ?, ?)
-                """, (email, password_hash, username, first_name, last_name, datetime.now()))
+                    RETURNING *
+                """, (email, password_hash, username, first_name, last_name, now))
                 
-                user_id = cursor.lastrowid
+                user_row = cursor.fetchone()
+                user_id = user_row['id']
                 
                 # Create default favorites collection
                 cursor.execute("""
                     INSERT INTO collections (name, description, user_id, is_favorite, created_at)
                     VALUES ('My Favorites', 'Default favorites collection', ?, 1, ?)
-                """, (user_id, datetime.now()))
+                """, (user_id, now))
                 
                 conn.commit()
                 
                 # Return created user
-                return self.get_user_by_id(user_id)
+                user = self._row_to_user(user_row)
+                self._user_cache.put(user_id, user)
+                return user
                 
         except Exception as e:
             logger.error(f"Failed to create user: {e}")
@@ -268,18 +630,24 @@ class DatabaseService:
             row = cursor.fetchone()
             
             if row:
-                return self._row_to_user(row)
+                return self._row_to_user(row, self._get_user_api_keys(row['id'], conn))
             return None
     
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
+        cached = self._user_cache.get(user_id)
+        if cached is not None:
+            return cached
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM users WHERE id = ? AND is_active = 1", (user_id,))
             row = cursor.fetchone()
             
             if row:
-                return self._row_to_user(row)
+                user = self._row_to_user(row, self._get_user_api_keys(user_id, conn))
+                self._user_cache.put(user_id, user)
+                return user
             return None
     
     def update_user_preferences(self, user_id: int, preferences: UserPreferences) -> bool:
@@ -292,6 +660,7 @@ class DatabaseService:
                 """, (preferences.to_json(), user_id))
                 
                 conn.commit()
+                self.invalidate_user_cache(user_id)
                 return cursor.rowcount > 0
                 
         except Exception as e:
@@ -303,32 +672,45 @@ class DatabaseService:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO user_api_keys (user_id, service, encrypted_key)
+                    SELECT id, ?, ? FROM users WHERE id = ?
+                    ON CONFLICT (user_id, service) DO UPDATE SET encrypted_key = excluded.encrypted_key
+                """, (service, encrypted_key, user_id))
                 
-                # Get current api_keys
-                cursor.execute("SELECT api_keys FROM users WHERE id = ?", (user_id,))
-                row = cursor.fetchone()
-                if not row:
-                    return False
-                
-                # Parse existing api_keys JSON
-                try:
-                    api_keys = json.loads(row[0]) if row[0] else {}
-                except json.JSONDecodeError:
-                    api_keys = {}
-                
-                # Update with new key
-                api_keys[service] = encrypted_key
+                conn.commit()
+                self.invalidate_user_cache(user_id)
+                return cursor.rowcount > 0
                 
-                # Save back to database
+        except Exception as e:
+            logger.error(f"Failed to store API key: {e}")
+            return False
+    
+    def get_api_key(self, user_id: int, service: str) -> Optional[str]:
+        """Get a user's encrypted API key for a service"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT encrypted_key FROM user_api_keys WHERE user_id = ? AND service = ?
+            """, (user_id, service))
+            row = cursor.fetchone()
+            return row[0] if row else None
+    
+    def delete_api_key(self, user_id: int, service: str) -> bool:
+        """Remove a user's API key for a service"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
                 cursor.execute("""
-                    UPDATE users SET api_keys = ? WHERE id = ?
-                """, (json.dumps(api_keys), user_id))
+                    DELETE FROM user_api_keys WHERE user_id = ? AND service = ?
+                """, (user_id, service))
                 
                 conn.commit()
-                return True
+                self.invalidate_user_cache(user_id)
+                return cursor.rowcount > 0
                 
         except Exception as e:
-            logger.error(f"Failed to store API key: {e}")
+            logger.error(f"Failed to delete API key: {e}")
             return False
     
     def update_last_login(self, user_id: int) -> bool:
@@ -339,9 +721,10 @@ class DatabaseService:
                 cursor.execute("""
                     UPDATE users SET last_login = ?, login_count = login_count + 1 
                     WHERE id = ?
-                """, (datetime.now(), user_id))
+                """, (_now_timestamp(), user_id))
                 
                 conn.commit()
+                self.invalidate_user_cache(user_id)
                 return cursor.rowcount > 0
                 
         except Exception as e:
@@ -377,41 +760,141 @@ class DatabaseService:
                 FROM user_sessions s 
                 JOIN users u ON s.user_id = u.id 
                 WHERE s.session_token = ? AND (s.expires_at IS NULL OR s.expires_at > ?)
-            """, (session_token, datetime.now()))
+            """, (session_token, _now_timestamp()))
             
             row = cursor.fetchone()
             if row:
+                # Prefer a buffered activity touch that hasn't been flushed yet
+                with self._activity_lock:
+                    pending_activity = self._activity_dirty.get(session_token)
                 return UserSession(
                     user_id=row['user_id'],
                     email=row['email'],
                     username=row['username'] or '',
                     session_token=row['session_token'],
-                    created_at=datetime.fromisoformat(row['created_at']),
-                    expires_at=datetime.fromisoformat(row['expires_at']) if row['expires_at'] else None,
-                    last_activity=datetime.fromisoformat(row['last_activity']),
+                    created_at=_parse_cached_timestamp(row['created_at']),
+                    expires_at=_parse_cached_timestamp(row['expires_at']) if row['expires_at'] else None,
+                    last_activity=pending_activity or _parse_cached_timestamp(row['last_activity']),
                     ip_address=row['ip_address'],
                     user_agent=row['user_agent']
                 )
             return None
     
     def update_session_activity(self, session_token: str) -> bool:
-        """Update session last activity timestamp"""
+        """
+        Record session activity.
+        
+        The timestamp is buffered in memory and written back in one batch by
+        flush_session_activity, keeping a commit off every authenticated request.
+        """
+        with self._activity_lock:
+            self._activity_dirty[session_token] = datetime.now()
+        
+        if self._is_memory_db:
+            # Thread-local in-memory databases can't be reached from the
+            # flusher thread, so write back on the caller's connection
+            return self.flush_session_activity() >= 0
+        
+        self._start_activity_flusher()
+        return True
+    
+    def flush_session_activity(self) -> int:
+        """Write buffered session activity timestamps, returning rows updated (-1 on error)"""
+        with self._activity_lock:
+            if not self._activity_dirty:
+                return 0
+            pending = self._activity_dirty
+            self._activity_dirty = {}
+        
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
+                cursor.executemany("""
                     UPDATE user_sessions SET last_activity = ? WHERE session_token = ?
-                """, (datetime.now(), session_token))
+                """, [(last_activity, token) for token, last_activity in pending.items()])
                 
                 conn.commit()
-                return cursor.rowcount > 0
+                return cursor.rowcount
                 
         except Exception as e:
             logger.error(f"Failed to update session activity: {e}")
+            # Put the touches back unless a newer one arrived meanwhile
+            with self._activity_lock:
+                for token, last_activity in pending.items():
+                    self._activity_dirty.setdefault(token, last_activity)
+            return -1
+    
+    def _start_activity_flusher(self):
+        """Start the background thread that drains buffered session activity"""
+        if self._activity_thread is not None:
+            return
+        with self._activity_lock:
+            if self._activity_thread is not None:
+                return
+            self._activity_thread = threading.Thread(
+                target=self._activity_flush_loop,
+                name="session-activity-flusher",
+                daemon=True
+            )
+            self._activity_thread.start()
+    
+    def _activity_flush_loop(self):
+        """Flush buffered session activity every SESSION_ACTIVITY_FLUSH_SECONDS"""
+        while not self._activity_stop.wait(self.SESSION_ACTIVITY_FLUSH_SECONDS):
+            self.flush_session_activity()
+    
+    def close(self):
+        """Stop background work and flush pending session activity"""
+        _open_services.discard(self)
+        self._activity_stop.set()
+        if self._activity_thread is not None:
+            self._activity_thread.join(timeout=self.SESSION_ACTIVITY_FLUSH_SECONDS)
+            self._activity_thread = None
+        self.flush_session_activity()
+        
+        # Let SQLite refresh any statistics the queries run so far would benefit from
+        try:
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA optimize")
+        except Exception as e:
+            logger.warning(f"PRAGMA optimize failed on close: {e}")
+        
+        # Release the connection of every thread that used this service
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.warning(f"Error closing database connection: {e}")
+        self._local.connection = None
+        self._reset_connection_depth()
+    
+    def maybe_analyze(self, rows_written: int = 0, force: bool = False) -> bool:
+        """
+        Refresh planner statistics once enough rows have been written in batches.
+        
+        Returns True if ANALYZE ran.
+        """
+        self._rows_since_analyze += rows_written
+        if not force and self._rows_since_analyze < self.ANALYZE_ROW_THRESHOLD:
+            return False
+        
+        try:
+            with self.get_connection() as conn:
+                conn.execute("ANALYZE")
+                conn.commit()
+            self._rows_since_analyze = 0
+            logger.info("Refreshed planner statistics")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to analyze database: {e}")
             return False
     
     def delete_session(self, session_token: str) -> bool:
         """Delete a session (logout)"""
+        with self._activity_lock:
+            self._activity_dirty.pop(session_token, None)
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
@@ -431,7 +914,7 @@ class DatabaseService:
                 cursor.execute("""
                     DELETE FROM user_sessions 
                     WHERE expires_at IS NOT NULL AND expires_at < ?
-                """, (datetime.now(),))
+                """, (_now_timestamp(),))
                 
                 deleted_count = cursor.rowcount
                 conn.commit()
@@ -460,6 +943,7 @@ class DatabaseService:
                         servings, difficulty_level, cuisine_type, meal_category, dietary_tags,
                         nutritional_info, created_by, source_url, is_public
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING *
                 """, (
                     recipe_data['name'],
                     recipe_data.get('description', ''),
@@ -471,32 +955,44 @@ class DatabaseService:
                     recipe_data.get('cuisine_type', ''),
                     recipe_data.get('meal_category', ''),
                     ','.join(recipe_data.get('dietary_tags', [])),
-                    json.dumps(recipe_data.get('nutritional_info', {})),
+                    json_dumps(recipe_data.get('nutritional_info', {})),
                     user_id,
                     recipe_data.get('source_url', ''),
                     recipe_data.get('is_public', True)
                 ))
                 
-                recipe_id = cursor.lastrowid
+                recipe_row = cursor.fetchone()
+                recipe_id = recipe_row['id']
+                self._set_recipe_dietary_tags(cursor, recipe_id, recipe_data.get('dietary_tags', []))
                 
                 # Insert recipe ingredients
-                ingredients = recipe_data.get('ingredients', [])
-                for i, ingredient_data in enumerate(ingredients):
-                    cursor.execute("""
-                        INSERT INTO recipe_ingredients (
-                            recipe_id, ingredient_id, quantity, unit, preparation_note, ingredient_order
-                        ) VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
-                        recipe_id,
-                        ingredient_data['ingredient_id'],
-                        ingredient_data['quantity'],
-                        ingredient_data['unit'],
-                        ingredient_data.get('preparation_note', ''),
-                        i + 1
-                    ))
+                recipe_ingredients = [
+                    RecipeIngredient(
+                        recipe_id=recipe_id,
+                        ingredient_id=ingredient_data['ingredient_id'],
+                        quantity=ingredient_data['quantity'],
+                        unit=ingredient_data['unit'],
+                        preparation_note=ingredient_data.get('preparation_note', ''),
+                        ingredient_order=i + 1
+                    )
+                    for i, ingredient_data in enumerate(recipe_data.get('ingredients', []))
+                ]
+                cursor.executemany("""
+                    INSERT INTO recipe_ingredients (
+                        recipe_id, ingredient_id, quantity, unit, preparation_note, ingredient_order
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                """, [
+                    (ri.recipe_id, ri.ingredient_id, ri.quantity, ri.unit, ri.preparation_note, ri.ingredient_order)
+                    for ri in recipe_ingredients
+                ])
                 
                 conn.commit()
-                return self.get_recipe_by_id(recipe_id)
+                
+                # Build the result from the returned row and the rows we just wrote
+                recipe = self._row_to_recipe(recipe_row)
+                recipe.ingredients = recipe_ingredients
+                recipe.required_ingredient_ids = {ri.ingredient_id for ri in recipe_ingredients}
+                return recipe
                 
         except Exception as e:
             logger.error(f"Failed to create recipe: {e}")
@@ -504,6 +1000,11 @@ class DatabaseService:
     
     def get_recipe_by_id(self, recipe_id: int, include_ingredients: bool = True) -> Optional[Recipe]:
         """Get recipe by ID with optional ingredient details"""
+        cache_key = (recipe_id, include_ingredients)
+        cached = self._recipe_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
@@ -525,10 +1026,10 @@ class DatabaseService:
                     ORDER BY ri.ingredient_order
                 """, (recipe_id,))
                 
-                ingredient_rows = cursor.fetchall()
-                recipe.ingredients = [self._row_to_recipe_ingredient(row) for row in ingredient_rows]
-                recipe.required_ingredient_ids = {row['ingredient_id'] for row in ingredient_rows}
+                recipe.ingredients = [self._row_to_recipe_ingredient(row) for row in cursor]
+                recipe.required_ingredient_ids = {ri.ingredient_id for ri in recipe.ingredients}
             
+            self._recipe_cache.put(cache_key, recipe)
             return recipe
     
     def get_recipes_by_ingredients(self, ingredient_ids: List[int], user_id: int = None, 
@@ -539,132 +1040,147 @@ class DatabaseService:
         """
         if not ingredient_ids:
             return []
+        query, params = self._recipes_by_ingredients_query(ingredient_ids, user_id, exact_match)
+        return self._fetch_all(query, params, self._row_to_recipe_with_ingredient_ids)
+    
+    def iter_recipes_by_ingredients(self, ingredient_ids: List[int], user_id: int = None,
+                                    exact_match: bool = False) -> Iterator[Recipe]:
+        """Stream recipes that can be made with given ingredients (see get_recipes_by_ingredients)"""
+        if not ingredient_ids:
+            return iter(())
+        query, params = self._recipes_by_ingredients_query(ingredient_ids, user_id, exact_match)
+        return self._iter_pages(query, params, self._row_to_recipe_with_ingredient_ids)
+    
+    def _recipes_by_ingredients_query(self, ingredient_ids: List[int], user_id: Optional[int],
+                                      exact_match: bool) -> Tuple[str, list]:
+        """Build the query and parameters for the recipes-by-ingredients reads"""
+        # Build query for ingredient filtering
+        ingredient_placeholders = ','.join(['?'] * len(ingredient_ids))
         
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Build query for ingredient filtering
-            ingredient_placeholders = ','.join(['?'] * len(ingredient_ids))
-            
-            if exact_match:
-                # Recipes that use ONLY these ingredients
-                query = f"""
-                    SELECT DISTINCT r.*
-                    FROM recipes r
-                    WHERE r.is_public = 1 OR r.created_by = ?
-                    AND r.id IN (
-                        SELECT ri.recipe_id
-                        FROM recipe_ingredients ri
-                        WHERE ri.ingredient_id IN ({ingredient_placeholders})
-                        GROUP BY ri.recipe_id
-                        HAVING COUNT(DISTINCT ri.ingredient_id) = (
-                            SELECT COUNT(*) FROM recipe_ingredients WHERE recipe_id = ri.recipe_id
-                        )
-                        AND COUNT(DISTINCT ri.ingredient_id) = ?
-                    )
-                    ORDER BY r.rating DESC, r.name ASC
-                """
-                params = [user_id or 0] + ingredient_ids + [len(ingredient_ids)]
-            else:
-                # Recipes that can be made with these ingredients (may use subset)
-                query = f"""
-                    SELECT DISTINCT r.*
-                    FROM recipes r
-                    JOIN recipe_ingredients ri ON r.id = ri.recipe_id
-                    WHERE (r.is_public = 1 OR r.created_by = ?)
-                    AND r.id NOT IN (
-                        SELECT DISTINCT ri2.recipe_id
-                        FROM recipe_ingredients ri2
-                        WHERE ri2.ingredient_id NOT IN ({ingredient_placeholders})
+        if exact_match:
+            # Recipes that use ONLY these ingredients
+            query = f"""
+                SELECT DISTINCT r.*
+                FROM recipes r
+                WHERE r.is_public = 1 OR r.created_by = ?
+                AND r.id IN (
+                    SELECT ri.recipe_id
+                    FROM recipe_ingredients ri
+                    WHERE ri.ingredient_id IN ({ingredient_placeholders})
+                    GROUP BY ri.recipe_id
+                    HAVING COUNT(DISTINCT ri.ingredient_id) = (
+                        SELECT COUNT(*) FROM recipe_ingredients WHERE recipe_id = ri.recipe_id
                     )
-                    ORDER BY r.rating DESC, r.name ASC
-                """
-                params = [user_id or 0] + ingredient_ids
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            recipes = []
-            for row in rows:
-                recipe = self._row_to_recipe(row)
-                # Load ingredient IDs for filtering logic
-                recipe.required_ingredient_ids = self._get_recipe_ingredient_ids(recipe.id, conn)
-                recipes.append(recipe)
-            
-            return recipes
+                    AND COUNT(DISTINCT ri.ingredient_id) = ?
+                )
+                ORDER BY r.rating DESC, r.name ASC
+            """
+            params = [user_id or 0] + ingredient_ids + [len(ingredient_ids)]
+        else:
+            # Recipes that can be made with these ingredients (may use subset)
+            query = f"""
+                SELECT DISTINCT r.*
+                FROM recipes r
+                JOIN recipe_ingredients ri ON r.id = ri.recipe_id
+                WHERE (r.is_public = 1 OR r.created_by = ?)
+                AND r.id NOT IN (
+                    SELECT DISTINCT ri2.recipe_id
+                    FROM recipe_ingredients ri2
+                    WHERE ri2.ingredient_id NOT IN ({ingredient_placeholders})
+                )
+                ORDER BY r.rating DESC, r.name ASC
+            """
+            params = [user_id or 0] + ingredient_ids
+        
+        return query, params
+    
+    def _row_to_recipe_with_ingredient_ids(self, row, conn) -> Recipe:
+        """Convert a recipe row and load its ingredient IDs for filtering logic"""
+        recipe = self._row_to_recipe(row)
+        recipe.required_ingredient_ids = self._get_recipe_ingredient_ids(recipe.id, conn)
+        return recipe
     
     def search_recipes(self, query: str, user_id: int = None, filters: Dict[str, Any] = None) -> List[Recipe]:
         """
         Search recipes with fuzzy matching on names and descriptions.
         Supports additional filters for cuisine, difficulty, etc.
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Base query with fuzzy search
-            base_query = """
-                SELECT DISTINCT r.*
-                FROM recipes r
-                WHERE (r.is_public = 1 OR r.created_by = ?)
-                AND (
-                    r.name LIKE ? 
-                    OR r.description LIKE ?
-                    OR r.cuisine_type LIKE ?
-                    OR r.meal_category LIKE ?
-                )
-            """
-            
-            # Parameters for base query
-            search_term = f"%{query}%"
-            params = [user_id or 0, search_term, search_term, search_term, search_term]
+        sql, params = self._search_recipes_query(query, user_id, filters)
+        return self._fetch_all(sql, params, self._row_to_recipe_on)
+    
+    def iter_search_recipes(self, query: str, user_id: int = None,
+                            filters: Dict[str, Any] = None) -> Iterator[Recipe]:
+        """Stream recipe search results (see search_recipes)"""
+        sql, params = self._search_recipes_query(query, user_id, filters)
+        return self._iter_pages(sql, params, self._row_to_recipe_on)
+    
+    def _search_recipes_query(self, query: str, user_id: Optional[int],
+                              filters: Optional[Dict[str, Any]]) -> Tuple[str, list]:
+        """Build the query and parameters for the recipe search reads"""
+        # Base query with fuzzy search
+        base_query = """
+            SELECT DISTINCT r.*
+            FROM recipes r
+            WHERE (r.is_public = 1 OR r.created_by = ?)
+            AND (
+                r.name LIKE ? 
+                OR r.description LIKE ?
+                OR r.cuisine_type LIKE ?
+                OR r.meal_category LIKE ?
+            )
+        """
+        
+        # Parameters for base query
+        search_term = f"%{query}%"
+        params = [user_id or 0, search_term, search_term, search_term, search_term]
+        
+        # Add filters
+        if filters:
+            if filters.get('cuisine_type'):
+                base_query += " AND r.cuisine_type = ?"
+                params.append(filters['cuisine_type'])
             
-            # Add filters
-            if filters:
-                if filters.get('cuisine_type'):
-                    base_query += " AND r.cuisine_type = ?"
-                    params.append(filters['cuisine_type'])
-                
-                if filters.get('difficulty_level'):
-                    base_query += " AND r.difficulty_level = ?"
-                    params.append(filters['difficulty_level'])
-                
-                if filters.get('meal_category'):
-                    base_query += " AND r.meal_category = ?"
-                    params.append(filters['meal_category'])
-                
-                if filters.get('max_cook_time'):
-                    base_query += " AND (r.prep_time_minutes + r.cook_time_minutes) <= ?"
-                    params.append(filters['max_cook_time'])
-                
-                if filters.get('dietary_tags'):
-                    # Filter by dietary tags (inclusive)
-                    dietary_conditions = []
-                    for tag in filters['dietary_tags']:
-                        dietary_conditions.append("r.dietary_tags LIKE ?")
-                        params.append(f"%{tag}%")
-                    if dietary_conditions:
-                        base_query += " AND (" + " OR ".join(dietary_conditions) + ")"
+            if filters.get('difficulty_level'):
+                base_query += " AND r.difficulty_level = ?"
+                params.append(filters['difficulty_level'])
             
-            base_query += " ORDER BY r.rating DESC, r.name ASC LIMIT 100"
+            if filters.get('meal_category'):
+                base_query += " AND r.meal_category = ?"
+                params.append(filters['meal_category'])
             
-            cursor.execute(base_query, params)
-            rows = cursor.fetchall()
+            if filters.get('max_cook_time'):
+                base_query += " AND (r.prep_time_minutes + r.cook_time_minutes) <= ?"
+                params.append(filters['max_cook_time'])
             
-            return [self._row_to_recipe(row) for row in rows]
+            if filters.get('dietary_tags'):
+                # Filter by dietary tags (inclusive), matching whole tags
+                placeholders = ','.join('?' * len(filters['dietary_tags']))
+                base_query += f"""
+                    AND EXISTS (
+                        SELECT 1 FROM recipe_dietary_tags t
+                        WHERE t.recipe_id = r.id AND t.tag IN ({placeholders})
+                    )
+                """
+                params.extend(filters['dietary_tags'])
+        
+        base_query += " ORDER BY r.rating DESC, r.name ASC LIMIT 100"
+        
+        return base_query, params
+    
+    _ALL_RECIPES_SQL = """
+        SELECT * FROM recipes
+        WHERE is_public = 1 OR created_by = ?
+        ORDER BY created_at DESC
+        LIMIT ? OFFSET ?
+    """
     
     def get_all_recipes(self, user_id: int = None, limit: int = 100, offset: int = 0) -> List[Recipe]:
         """Get all accessible recipes for a user"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM recipes
-                WHERE is_public = 1 OR created_by = ?
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
-            """, (user_id or 0, limit, offset))
-            
-            rows = cursor.fetchall()
-            return [self._row_to_recipe(row) for row in rows]
+        return self._fetch_all(self._ALL_RECIPES_SQL, (user_id or 0, limit, offset), self._row_to_recipe_on)
+    
+    def iter_all_recipes(self, user_id: int = None, limit: int = 100, offset: int = 0) -> Iterator[Recipe]:
+        """Stream accessible recipes for a user, a page of rows at a time"""
+        return self._iter_pages(self._ALL_RECIPES_SQL, (user_id or 0, limit, offset), self._row_to_recipe_on)
     
     def update_recipe(self, recipe_id: int, recipe_data: Dict[str, Any], user_id: int) -> bool:
         """Update an existing recipe (only by creator)"""
@@ -672,21 +1188,14 @@ class DatabaseService:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Check ownership
-                cursor.execute("SELECT created_by FROM recipes WHERE id = ?", (recipe_id,))
-                row = cursor.fetchone()
-                if not row or row[0] != user_id:
-                    logger.warning(f"User {user_id} attempted to update recipe {recipe_id} without permission")
-                    return False
-                
-                # Update recipe
+                # Update recipe; the ownership check is part of the WHERE clause
                 cursor.execute("""
                     UPDATE recipes SET
                         name = ?, description = ?, instructions = ?,
                         prep_time_minutes = ?, cook_time_minutes = ?, servings = ?,
                         difficulty_level = ?, cuisine_type = ?, meal_category = ?,
                         dietary_tags = ?, nutritional_info = ?, updated_at = ?
-                    WHERE id = ?
+                    WHERE id = ? AND created_by = ?
                 """, (
                     recipe_data['name'],
                     recipe_data.get('description', ''),
@@ -698,10 +1207,16 @@ class DatabaseService:
                     recipe_data.get('cuisine_type', ''),
                     recipe_data.get('meal_category', ''),
                     ','.join(recipe_data.get('dietary_tags', [])),
-                    json.dumps(recipe_data.get('nutritional_info', {})),
-                    datetime.now(),
-                    recipe_id
+                    json_dumps(recipe_data.get('nutritional_info', {})),
+                    _now_timestamp(),
+                    recipe_id,
+                    user_id
                 ))
+                if cursor.rowcount == 0:
+                    logger.warning(f"User {user_id} attempted to update recipe {recipe_id} without permission (or it does not exist)")
+                    return False
+                
+                self._set_recipe_dietary_tags(cursor, recipe_id, recipe_data.get('dietary_tags', []))
                 
                 # Update ingredients if provided
                 if 'ingredients' in recipe_data:
@@ -724,6 +1239,7 @@ class DatabaseService:
                         ))
                 
                 conn.commit()
+                self.invalidate_recipe_cache(recipe_id)
                 return True
                 
         except Exception as e:
@@ -736,18 +1252,17 @@ class DatabaseService:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Check ownership
-                cursor.execute("SELECT created_by FROM recipes WHERE id = ?", (recipe_id,))
-                row = cursor.fetchone()
-                if not row or row[0] != user_id:
-                    logger.warning(f"User {user_id} attempted to delete recipe {recipe_id} without permission")
-                    return False
-                
-                # Delete recipe (cascade will handle ingredients and collections)
-                cursor.execute("DELETE FROM recipes WHERE id = ?", (recipe_id,))
+                # Delete recipe only if owned by the user (cascade will handle ingredients and collections)
+                cursor.execute("DELETE FROM recipes WHERE id = ? AND created_by = ?", (recipe_id, user_id))
+                deleted = cursor.rowcount > 0
                 conn.commit()
                 
-                return cursor.rowcount > 0
+                if not deleted:
+                    logger.warning(f"User {user_id} attempted to delete recipe {recipe_id} without permission (or it does not exist)")
+                    return False
+                
+                self.invalidate_recipe_cache(recipe_id)
+                return True
                 
         except Exception as e:
             logger.error(f"Failed to delete recipe: {e}")
@@ -757,20 +1272,39 @@ class DatabaseService:
     
     def get_all_ingredients(self) -> List[Ingredient]:
         """Get all ingredients from database"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM ingredients ORDER BY name")
-            rows = cursor.fetchall()
-            return [self._row_to_ingredient(row) for row in rows]
+        cached = self._all_ingredients_cache
+        if cached is None or cached[0] != self._ingredient_version:
+            version = self._ingredient_version
+            rows = self._fetch_all(self._ALL_INGREDIENTS_SQL, (), lambda values, conn: values,
+                                   plain_tuples=True)
+            cached = (version, rows)
+            self._all_ingredients_cache = cached
+        
+        return [self._ingredient_from_values(*values) for values in cached[1]]
+    
+    # Plain tuples in a fixed column order are cheaper to build and unpack than Rows
+    _ALL_INGREDIENTS_SQL = f"SELECT {INGREDIENT_COLUMNS} FROM ingredients ORDER BY name"
+    
+    def iter_all_ingredients(self) -> Iterator[Ingredient]:
+        """Stream all ingredients from database, bypassing the list cache"""
+        return self._iter_pages(self._ALL_INGREDIENTS_SQL, (),
+                                lambda values, conn: self._ingredient_from_values(*values),
+                                plain_tuples=True)
     
     def get_ingredient_by_id(self, ingredient_id: int) -> Optional[Ingredient]:
         """Get ingredient by ID"""
+        cached = self._ingredient_cache.get(ingredient_id)
+        if cached is not None:
+            return cached
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM ingredients WHERE id = ?", (ingredient_id,))
             row = cursor.fetchone()
             if row:
-                return self._row_to_ingredient(row)
+                ingredient = self._row_to_ingredient(row)
+                self._ingredient_cache.put(ingredient_id, ingredient)
+                return ingredient
             return None
     
     def search_ingredients(self, query: str) -> List[Ingredient]:
@@ -786,8 +1320,7 @@ class DatabaseService:
                 LIMIT 20
             """, (f"%{query}%", f"%{query}%", f"{query}%"))
             
-            rows = cursor.fetchall()
-            return [self._row_to_ingredient(row) for row in rows]
+            return [self._row_to_ingredient(row) for row in cursor]
     
     def create_ingredient(self, name: str, category: str = "", **kwargs) -> Optional[Ingredient]:
         """Create a new ingredient"""
@@ -805,18 +1338,22 @@ class DatabaseService:
                 cursor.execute("""
                     INSERT INTO ingredients (name, category, common_substitutes, storage_tips, nutritional_data)
                     VALUES (?, ?, ?, ?, ?)
+                    RETURNING *
                 """, (
                     name,
                     category,
-                    ','.join(kwargs.get('common_substitutes', [])),
+                    Ingredient.substitutes_to_db(kwargs.get('common_substitutes', [])),
                     kwargs.get('storage_tips', ''),
-                    json.dumps(kwargs.get('nutritional_data', {}))
+                    json_dumps(kwargs.get('nutritional_data', {}))
                 ))
                 
-                ingredient_id = cursor.lastrowid
+                row = cursor.fetchone()
                 conn.commit()
                 
-                return self.get_ingredient_by_id(ingredient_id)
+                ingredient = self._row_to_ingredient(row)
+                self.invalidate_ingredient_cache(ingredient.id)
+                self._ingredient_cache.put(ingredient.id, ingredient)
+                return ingredient
                 
         except Exception as e:
             if "UNIQUE constraint failed" in str(e):
@@ -829,21 +1366,126 @@ class DatabaseService:
                 logger.error(f"Failed to create ingredient: {e}")
                 return None
     
+    def bulk_create_ingredients(self, items: List[Dict[str, Any]],
+                                chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> List[int]:
+        """
+        Create many ingredients in one transaction, returning their IDs in input order.
+        
+        Each item takes the same keys as create_ingredient (name, category,
+        common_substitutes, storage_tips, nutritional_data). Names that already
+        exist are left untouched and their existing IDs are returned.
+        """
+        rows = []
+        for item in items:
+            name = item.get('name', '').strip()
+            if not name:
+                continue
+            rows.append((
+                name,
+                item.get('category', ''),
+                Ingredient.substitutes_to_db(item.get('common_substitutes', [])),
+                item.get('storage_tips', ''),
+                json_dumps(item.get('nutritional_data', {}))
+            ))
+        if not rows:
+            return []
+        
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                ids_by_name: Dict[str, int] = {}
+                
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    cursor.executemany("""
+                        INSERT INTO ingredients (name, category, common_substitutes, storage_tips, nutritional_data)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT (name) DO NOTHING
+                    """, chunk)
+                    
+                    # Resolve IDs for both new and pre-existing names in the chunk
+                    names = list({row[0] for row in chunk})
+                    for name_start in range(0, len(names), SQLITE_MAX_PARAMS):
+                        batch = names[name_start:name_start + SQLITE_MAX_PARAMS]
+                        placeholders = ','.join('?' * len(batch))
+                        cursor.execute(f"SELECT id, name FROM ingredients WHERE name IN ({placeholders})", batch)
+                        ids_by_name.update((row['name'], row['id']) for row in cursor)
+                
+                conn.commit()
+                self.invalidate_ingredient_cache()
+                self.maybe_analyze(len(rows))
+                
+                logger.info(f"Bulk created ingredients: {len(rows)} rows in {(len(rows) - 1) // chunk_size + 1} chunks")
+                return [ids_by_name[row[0]] for row in rows]
+                
+        except Exception as e:
+            logger.error(f"Failed to bulk create ingredients: {e}")
+            return []
+    
     # Helper Methods
     
+    def _get_user_api_keys(self, user_id: int, conn) -> Dict[str, str]:
+        """Get a user's encrypted API keys by service"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT service, encrypted_key FROM user_api_keys WHERE user_id = ?", (user_id,))
+        return {row[0]: row[1] for row in cursor}
+    
+    def _set_recipe_dietary_tags(self, cursor, recipe_id: int, tags: List[str]):
+        """Replace a recipe's rows in recipe_dietary_tags"""
+        cursor.execute("DELETE FROM recipe_dietary_tags WHERE recipe_id = ?", (recipe_id,))
+        cursor.executemany(
+            "INSERT OR IGNORE INTO recipe_dietary_tags (recipe_id, tag) VALUES (?, ?)",
+            [(recipe_id, tag.strip()) for tag in tags if tag.strip()]
+        )
+    
+    def _fetch_all(self, query: str, params, convert, plain_tuples: bool = False) -> list:
+        """Run a read and convert every row with convert(row, conn) before releasing the connection"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if plain_tuples:
+                cursor.row_factory = None
+            cursor.execute(query, params)
+            return [convert(row, conn) for row in cursor.fetchall()]
+    
+    def _iter_pages(self, query: str, params, convert, plain_tuples: bool = False) -> Iterator:
+        """
+        Stream a read, fetching and converting STREAM_PAGE_SIZE rows per connection block.
+        
+        No connection block stays open across a yield, so a consumer that stops
+        early cannot leave one entered; the cursor is closed when the iterator
+        is exhausted, closed or garbage collected.
+        """
+        cursor = None
+        try:
+            while True:
+                with self.get_connection() as conn:
+                    if cursor is None:
+                        cursor = conn.cursor()
+                        if plain_tuples:
+                            cursor.row_factory = None
+                        cursor.execute(query, params)
+                    page = [convert(row, conn) for row in cursor.fetchmany(STREAM_PAGE_SIZE)]
+                if not page:
+                    return
+                yield from page
+        finally:
+            if cursor is not None:
+                cursor.close()
+    
+    def _row_to_recipe_on(self, row, conn) -> Recipe:
+        """_row_to_recipe in the (row, conn) shape _fetch_all and _iter_pages expect"""
+        return self._row_to_recipe(row)
+    
     def _get_recipe_ingredient_ids(self, recipe_id: int, conn) -> Set[int]:
         """Get set of ingredient IDs for a recipe"""
         cursor = conn.cursor()
         cursor.execute("SELECT ingredient_id FROM recipe_ingredients WHERE recipe_id = ?", (recipe_id,))
-        return {row[0] for row in cursor.fetchall()}
+        return {row[0] for row in cursor}
     
     def _row_to_recipe(self, row) -> Recipe:
         """Convert database row to Recipe object"""
         # Parse JSON fields safely
-        try:
-            nutritional_info = NutritionData(**json.loads(row['nutritional_info'])) if row['nutritional_info'] else None
-        except (json.JSONDecodeError, TypeError):
-            nutritional_info = None
+        nutritional_info = NutritionData.from_json(row['nutritional_info']) if row['nutritional_info'] else None
         
         dietary_tags = [tag.strip() for tag in row['dietary_tags'].split(',') if tag.strip()] if row['dietary_tags'] else []
         
@@ -861,8 +1503,8 @@ class DatabaseService:
             dietary_tags=dietary_tags,
             nutritional_info=nutritional_info,
             created_by=row['created_by'],
-            created_at=datetime.fromisoformat(row['created_at']),
-            updated_at=datetime.fromisoformat(row['updated_at']),
+            created_at=_parse_timestamp(row['created_at']),
+            updated_at=_parse_timestamp(row['updated_at']),
             source_url=row['source_url'],
             is_public=bool(row['is_public']),
             rating=row['rating'],
@@ -871,21 +1513,26 @@ class DatabaseService:
     
     def _row_to_ingredient(self, row) -> Ingredient:
         """Convert database row to Ingredient object"""
-        try:
-            nutritional_data = NutritionData(**json.loads(row['nutritional_data'])) if row['nutritional_data'] else None
-        except (json.JSONDecodeError, TypeError):
-            nutritional_data = None
+        return self._ingredient_from_values(
+            row['id'], row['name'], row['category'], row['common_substitutes'],
+            row['storage_tips'], row['nutritional_data'], row['created_at']
+        )
+    
+    def _ingredient_from_values(self, ingredient_id, name, category, common_substitutes,
+                                storage_tips, nutritional_data, created_at) -> Ingredient:
+        """Build an Ingredient from column values in INGREDIENT_COLUMNS order"""
+        nutrition = NutritionData.from_json(nutritional_data) if nutritional_data else None
         
-        common_substitutes = [sub.strip() for sub in row['common_substitutes'].split(',') if sub.strip()] if row['common_substitutes'] else []
+        substitutes = Ingredient.substitutes_from_db(common_substitutes)
         
         return Ingredient(
-            id=row['id'],
-            name=row['name'],
-            category=row['category'],
-            common_substitutes=common_substitutes,
-            storage_tips=row['storage_tips'],
-            nutritional_data=nutritional_data,
-            created_at=datetime.fromisoformat(row['created_at'])
+            id=ingredient_id,
+            name=name,
+            category=category,
+            common_substitutes=substitutes,
+            storage_tips=storage_tips,
+            nutritional_data=nutrition,
+            created_at=_parse_timestamp(created_at)
         )
     
     def _row_to_recipe_ingredient(self, row) -> RecipeIngredient:
@@ -901,14 +1548,8 @@ class DatabaseService:
     
     # Helper Methods
     
-    def _row_to_user(self, row) -> User:
-        """Convert database row to User object"""
-        # Parse JSON fields safely
-        try:
-            api_keys = json.loads(row['api_keys']) if row['api_keys'] else {}
-        except json.JSONDecodeError:
-            api_keys = {}
-        
+    def _row_to_user(self, row, api_keys: Optional[Dict[str, str]] = None) -> User:
+        """Convert database row to User object (API keys come from user_api_keys)"""
         try:
             preferences = UserPreferences.from_json(row['preferences']) if row['preferences'] else UserPreferences()
         except:
@@ -923,10 +1564,10 @@ class DatabaseService:
             last_name=row['last_name'] or '',
             is_active=bool(row['is_active']),
             is_verified=bool(row['is_verified']),
-            api_keys=api_keys,
+            api_keys=api_keys or {},
             preferences=preferences,
-            created_at=datetime.fromisoformat(row['created_at']),
-            last_login=datetime.fromisoformat(row['last_login']),
+            created_at=_parse_cached_timestamp(row['created_at']),
+            last_login=_parse_cached_timestamp(row['last_login']),
             login_count=row['login_count']
         )
 
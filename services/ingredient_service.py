@@ -7,18 +7,60 @@ Leverages Herbalism app ingredient loading patterns with recipe-specific enhance
 """
 
 import re
-import json
 import logging
-from typing import List, Optional, Dict, Set, Tuple, Any
-from collections import defaultdict, Counter
-from datetime import datetime
+import threading
+import time
+from typing import List, Optional, Dict, Set, Tuple, Any, Iterator, Sequence
+from collections import defaultdict
+from functools import lru_cache
 
 from models import Ingredient, NutritionData
 from services.database_service import DatabaseService, get_database_service
 from utils import get_logger
+from utils.json_utils import json_dumps
 
 logger = get_logger(__name__)
 
+# Cooking terms ignored when comparing ingredient names
+_REMOVE_WORDS_RE = re.compile(r'\b(?:fresh|dried|ground|whole|chopped|diced|minced)\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=4096)
+def _normalize_name(name: str) -> str:
+    """Normalize ingredient name for comparison (memoized, names repeat across scans)"""
+    return _WHITESPACE_RE.sub(' ', _REMOVE_WORDS_RE.sub('', name.lower())).strip()
+
+
+@lru_cache(maxsize=4096)
+def _name_words(normalized_name: str) -> frozenset:
+    """Word set of a normalized name, built once per name for overlap scoring"""
+    return frozenset(normalized_name.split())
+
+
+@lru_cache(maxsize=65536)
+def _pair_similarity(name1_normalized: str, name2_normalized: str) -> float:
+    """Similarity between two normalized names (memoized, pairs recur across duplicate checks)"""
+    # Exact match
+    if name1_normalized == name2_normalized:
+        return 1.0
+    
+    # Check if one contains the other
+    if name1_normalized in name2_normalized or name2_normalized in name1_normalized:
+        return 0.9
+    
+    # Word overlap scoring
+    words1 = _name_words(name1_normalized)
+    words2 = _name_words(name2_normalized)
+    
+    if not words1 or not words2:
+        return 0.0
+    
+    overlap = len(words1 & words2)
+    total = len(words1 | words2)
+    
+    return overlap / total if total > 0 else 0.0
+
 
 class IngredientService:
     """
@@ -29,16 +71,25 @@ class IngredientService:
     across all recipe-ingredient relationships.
     """
     
+    # Columns update_ingredient may set, in the order they appear in the SET clause.
+    # A fixed order keeps the SQL text identical for the same set of fields, so
+    # sqlite3's per-connection statement cache can reuse the prepared statement.
+    _UPDATABLE_FIELDS = ('name', 'category', 'common_substitutes', 'storage_tips', 'nutritional_data')
+    
     def __init__(self, database_service: Optional[DatabaseService] = None):
         self.db = database_service or get_database_service()
         
         # Cache for performance
         self._ingredient_cache = {}
-        self._cache_timestamp = None
+        self._cache_deadline = 0.0  # time.monotonic() value after which the cache is stale
+        # Immutable (ingredients, normalized names) snapshot of the cache, replaced
+        # as one tuple so readers never see the two columns out of step
+        self._cache_columns: Tuple[Tuple[Ingredient, ...], Tuple[str, ...]] = ((), ())
         self._cache_ttl_seconds = 300  # 5 minutes
         
         # Common ingredient categories for auto-categorization
         self._category_keywords = self._load_category_keywords()
+        self._category_matcher, self._keyword_categories = self._compile_category_matcher()
         
         # Similarity thresholds for duplicate detection
         self._similarity_thresholds = {
@@ -84,14 +135,31 @@ class IngredientService:
         """Get ingredient by ID with caching"""
         return self.db.get_ingredient_by_id(ingredient_id)
     
-    def get_all_ingredients(self, use_cache: bool = True) -> List[Ingredient]:
-        """Get all ingredients with optional caching"""
+    def get_all_ingredients(self, use_cache: bool = True) -> Sequence[Ingredient]:
+        """
+        Get all ingredients with optional caching.
+        
+        Returns the cached immutable tuple without copying; wrap it in list()
+        before mutating.
+        """
         if use_cache and self._is_cache_valid():
-            return list(self._ingredient_cache.values())
+            return self._cache_columns[0]
         
-        ingredients = self.db.get_all_ingredients()
-        self._update_cache(ingredients)
-        return ingredients
+        self._update_cache(self.db.get_all_ingredients())
+        return self._cache_columns[0]
+    
+    def iter_ingredients(self) -> Iterator[Ingredient]:
+        """
+        Stream all ingredients without materializing the full list.
+        
+        Serves from the cache when it is valid; otherwise reads straight from the
+        database (falling back to a list on backends without a streaming API).
+        """
+        if self._is_cache_valid():
+            return iter(self._cache_columns[0])
+        if hasattr(self.db, 'iter_all_ingredients'):
+            return self.db.iter_all_ingredients()
+        return iter(self.db.get_all_ingredients())
     
     def update_ingredient(self, ingredient_id: int, **updates) -> Optional[Ingredient]:
         """
@@ -116,18 +184,19 @@ class IngredientService:
                 update_fields = []
                 update_values = []
                 
-                for field, value in updates.items():
+                for field in self._UPDATABLE_FIELDS:
+                    if field not in updates:
+                        continue
+                    value = updates[field]
                     if field in ['name', 'category', 'storage_tips']:
                         update_fields.append(f"{field} = ?")
                         update_values.append(value)
                     elif field == 'common_substitutes':
-                        if isinstance(value, list):
-                            value = ','.join(value)
                         update_fields.append("common_substitutes = ?")
-                        update_values.append(value)
+                        update_values.append(Ingredient.substitutes_to_db(value or []))
                     elif field == 'nutritional_data':
                         update_fields.append("nutritional_data = ?")
-                        update_values.append(json.dumps(value if value else {}))
+                        update_values.append(json_dumps(value if value else {}))
                 
                 if not update_fields:
                     logger.warning(f"No valid fields to update for ingredient {ingredient_id}")
@@ -172,19 +241,21 @@ class IngredientService:
         """
         try:
             with self.db.get_connection() as conn:
-                # Check if ingredient is used in recipes
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT COUNT(*) as usage_count 
-                    FROM recipe_ingredients 
-                    WHERE ingredient_id = ?
-                """, (ingredient_id,))
                 
-                usage_count = cursor.fetchone()['usage_count']
-                
-                if usage_count > 0 and not force:
-                    logger.warning(f"Cannot delete ingredient {ingredient_id}: used in {usage_count} recipes")
-                    return False
+                # Check if ingredient is used in recipes; only existence matters,
+                # and a forced delete doesn't need to look at all
+                if not force:
+                    cursor.execute("""
+                        SELECT EXISTS(
+                            SELECT 1 FROM recipe_ingredients 
+                            WHERE ingredient_id = ?
+                        )
+                    """, (ingredient_id,))
+                    
+                    if cursor.fetchone()[0]:
+                        logger.warning(f"Cannot delete ingredient {ingredient_id}: used in recipes")
+                        return False
                 
                 # Delete ingredient (CASCADE will handle recipe_ingredients)
                 cursor.execute("DELETE FROM ingredients WHERE id = ?", (ingredient_id,))
@@ -196,7 +267,7 @@ class IngredientService:
                 conn.commit()
                 self._invalidate_cache()
                 
-                logger.info(f"Deleted ingredient {ingredient_id} (was used in {usage_count} recipes)")
+                logger.info(f"Deleted ingredient {ingredient_id}" + (" (forced)" if force else ""))
                 return True
                 
         except Exception as e:
@@ -216,20 +287,21 @@ class IngredientService:
         Returns:
             List of potential duplicate ingredients
         """
-        all_ingredients = self.get_all_ingredients()
-        duplicates = []
+        all_ingredients, normalized = self._get_name_columns()
+        scored = []
         
         name_normalized = self._normalize_ingredient_name(name)
+        name_lower = name.lower()
         
-        for ingredient in all_ingredients:
-            similarity = self._calculate_ingredient_similarity(name_normalized, ingredient.name)
-            if similarity >= threshold and ingredient.name.lower() != name.lower():
-                duplicates.append(ingredient)
+        for ingredient, ingredient_normalized in zip(all_ingredients, normalized):
+            similarity = self._normalized_similarity(name_normalized, ingredient_normalized)
+            if similarity >= threshold and ingredient.name.lower() != name_lower:
+                scored.append((similarity, ingredient))
         
-        # Sort by similarity score (highest first)
-        duplicates.sort(key=lambda ing: self._calculate_ingredient_similarity(name_normalized, ing.name), reverse=True)
+        # Sort by similarity score (highest first), reusing the scores computed above
+        scored.sort(key=lambda item: item[0], reverse=True)
         
-        return duplicates
+        return [ingredient for _, ingredient in scored]
     
     def find_all_duplicates(self, threshold: float = 0.8) -> Dict[str, List[Ingredient]]:
         """
@@ -241,22 +313,43 @@ class IngredientService:
         Returns:
             Dict mapping ingredient names to lists of similar ingredients
         """
-        all_ingredients = self.get_all_ingredients()
+        all_ingredients, normalized = self._get_name_columns()
         duplicate_groups = defaultdict(list)
         processed = set()
         
+        # Index the normalized names by blocking key, so each ingredient is
+        # only compared with ingredients it could possibly match
+        blocking_keys = [self._blocking_keys(name) for name in normalized]
+        key_to_indices: Dict[str, List[int]] = defaultdict(list)
+        short_indices = []
+        for index, name in enumerate(normalized):
+            if len(name) < 3:
+                short_indices.append(index)
+            for key in blocking_keys[index]:
+                key_to_indices[key].append(index)
+        
         for i, ingredient1 in enumerate(all_ingredients):
             if ingredient1.id in processed:
                 continue
                 
             similar_ingredients = []
-            name1_normalized = self._normalize_ingredient_name(ingredient1.name)
+            name1_normalized = normalized[i]
+            
+            if len(name1_normalized) < 3:
+                # Very short names can be contained in anything; compare against all
+                candidates = range(i + 1, len(all_ingredients))
+            else:
+                candidate_set = set(short_indices)
+                for key in blocking_keys[i]:
+                    candidate_set.update(key_to_indices[key])
+                candidates = sorted(j for j in candidate_set if j > i)
             
-            for j, ingredient2 in enumerate(all_ingredients[i+1:], i+1):
+            for j in candidates:
+                ingredient2 = all_ingredients[j]
                 if ingredient2.id in processed:
                     continue
                     
-                similarity = self._calculate_ingredient_similarity(name1_normalized, ingredient2.name)
+                similarity = self._normalized_similarity(name1_normalized, normalized[j])
                 if similarity >= threshold:
                     similar_ingredients.append(ingredient2)
                     processed.add(ingredient2.id)
@@ -301,44 +394,31 @@ class IngredientService:
                     return False
                 
                 cursor = conn.cursor()
+                duplicate_id_list = [duplicate.id for duplicate in duplicates]
+                placeholders = ','.join('?' * len(duplicate_id_list))
                 
-                # Update recipe_ingredients references
-                for duplicate in duplicates:
-                    # Check for conflicts (recipes that use both primary and duplicate)
-                    cursor.execute("""
-                        SELECT recipe_id FROM recipe_ingredients 
-                        WHERE ingredient_id = ? AND recipe_id IN (
-                            SELECT recipe_id FROM recipe_ingredients 
-                            WHERE ingredient_id = ?
-                        )
-                    """, (duplicate.id, primary_id))
-                    
-                    conflicted_recipes = cursor.fetchall()
-                    
-                    if conflicted_recipes:
-                        logger.warning(f"Found {len(conflicted_recipes)} recipes using both primary and duplicate ingredient {duplicate.name}")
-                        # For now, just delete the duplicate entries (user will need to manually resolve)
-                        cursor.execute("""
-                            DELETE FROM recipe_ingredients 
-                            WHERE ingredient_id = ? AND recipe_id IN (
-                                SELECT recipe_id FROM recipe_ingredients 
-                                WHERE ingredient_id = ?
-                            )
-                        """, (duplicate.id, primary_id))
-                    
-                    # Update remaining references
-                    cursor.execute("""
-                        UPDATE recipe_ingredients 
-                        SET ingredient_id = ? 
-                        WHERE ingredient_id = ?
-                    """, (primary_id, duplicate.id))
+                # Repoint recipe_ingredients references in one statement; rows whose
+                # recipe already uses the primary (or an earlier duplicate) are skipped
+                cursor.execute(f"""
+                    UPDATE OR IGNORE recipe_ingredients 
+                    SET ingredient_id = ? 
+                    WHERE ingredient_id IN ({placeholders})
+                """, [primary_id] + duplicate_id_list)
+                
+                # Whatever is left conflicted; just delete the duplicate entries
+                # (user will need to manually resolve)
+                cursor.execute(f"""
+                    DELETE FROM recipe_ingredients 
+                    WHERE ingredient_id IN ({placeholders})
+                """, duplicate_id_list)
+                if cursor.rowcount > 0:
+                    logger.warning(f"Found {cursor.rowcount} recipe entries already using {primary.name}; removed the duplicate entries")
                 
                 # Merge additional data from duplicates into primary
                 self._merge_ingredient_data(primary, duplicates, conn)
                 
                 # Delete duplicate ingredients
-                for duplicate in duplicates:
-                    cursor.execute("DELETE FROM ingredients WHERE id = ?", (duplicate.id,))
+                cursor.execute(f"DELETE FROM ingredients WHERE id IN ({placeholders})", duplicate_id_list)
                 
                 conn.commit()
                 self._invalidate_cache()
@@ -373,7 +453,7 @@ class IngredientService:
                 SET common_substitutes = ?, storage_tips = ?
                 WHERE id = ?
             """, (
-                ','.join(all_substitutes) if all_substitutes else '',
+                Ingredient.substitutes_to_db(sorted(all_substitutes)),
                 storage_tips,
                 primary.id
             ))
@@ -395,9 +475,9 @@ class IngredientService:
         """
         results = {'updated': 0, 'skipped': 0, 'errors': 0}
         
-        ingredients = self.get_all_ingredients()
+        updates = []  # (new_category, ingredient_id) pairs, written in one batch
         
-        for ingredient in ingredients:
+        for ingredient in self.iter_ingredients():
             try:
                 # Skip if already has category
                 if ingredient.category and ingredient.category.strip():
@@ -412,11 +492,7 @@ class IngredientService:
                     new_category = self.auto_categorize_ingredient(ingredient.name)
                 
                 if new_category:
-                    updated = self.update_ingredient(ingredient.id, category=new_category)
-                    if updated:
-                        results['updated'] += 1
-                    else:
-                        results['errors'] += 1
+                    updates.append((new_category, ingredient.id))
                 else:
                     results['skipped'] += 1
                     
@@ -424,6 +500,19 @@ class IngredientService:
                 logger.error(f"Error categorizing ingredient {ingredient.name}: {e}")
                 results['errors'] += 1
         
+        if updates:
+            try:
+                with self.db.get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.executemany("UPDATE ingredients SET category = ? WHERE id = ?", updates)
+                    conn.commit()
+                    results['updated'] += cursor.rowcount
+                    results['errors'] += len(updates) - cursor.rowcount
+                self._invalidate_cache()
+            except Exception as e:
+                logger.error(f"Error writing bulk categorization: {e}")
+                results['errors'] += len(updates)
+        
         logger.info(f"Bulk categorization completed: {results}")
         return results
     
@@ -437,78 +526,82 @@ class IngredientService:
         Returns:
             Suggested category or empty string if no match
         """
-        name_lower = name.lower()
-        
-        for category, keywords in self._category_keywords.items():
-            for keyword in keywords:
-                if keyword in name_lower:
-                    return category
-        
-        return ""
+        # Earlier categories win, as if each category's keywords were checked in order
+        best = None
+        for match in self._category_matcher.finditer(name.lower()):
+            priority, category = self._keyword_categories[match.group(1)]
+            if best is None or priority < best[0]:
+                best = (priority, category)
+                if priority == 0:
+                    break
+        
+        return best[1] if best else ""
     
-    def get_ingredient_stats(self) -> Dict[str, Any]:
-        """Get comprehensive ingredient statistics"""
-        ingredients = self.get_all_ingredients()
+    def get_ingredient_stats(self, include_duplicates: bool = False) -> Dict[str, Any]:
+        """
+        Get comprehensive ingredient statistics.
         
-        # Category distribution
-        category_counts = Counter(ing.category for ing in ingredients if ing.category)
+        Counts are aggregated in SQL. The duplicate-group scan needs every
+        ingredient loaded, so its keys are only included when the caller
+        passes include_duplicates=True.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT category, COUNT(*) FROM ingredients GROUP BY category")
+            category_rows = cursor.fetchall()
         
-        # Find uncategorized
-        uncategorized = [ing for ing in ingredients if not ing.category or not ing.category.strip()]
+        # Category distribution
+        category_counts = {category: count for category, count in category_rows if category}
         
-        # Find potential duplicates
-        duplicates = self.find_all_duplicates(threshold=0.8)
+        # Count uncategorized (missing or blank category)
+        total = sum(count for _, count in category_rows)
+        uncategorized = sum(count for category, count in category_rows if not category or not category.strip())
         
-        return {
-            'total_ingredients': len(ingredients),
-            'categorized': len(ingredients) - len(uncategorized),
-            'uncategorized': len(uncategorized),
-            'categories': dict(category_counts),
-            'potential_duplicate_groups': len(duplicates),
-            'ingredients_in_duplicate_groups': sum(len(group) for group in duplicates.values())
+        stats = {
+            'total_ingredients': total,
+            'categorized': total - uncategorized,
+            'uncategorized': uncategorized,
+            'categories': category_counts
         }
+        
+        if include_duplicates:
+            # Find potential duplicates
+            duplicates = self.find_all_duplicates(threshold=0.8)
+            stats['potential_duplicate_groups'] = len(duplicates)
+            stats['ingredients_in_duplicate_groups'] = sum(len(group) for group in duplicates.values())
+        
+        return stats
     
     # Utility Methods
     
     def _normalize_ingredient_name(self, name: str) -> str:
         """Normalize ingredient name for comparison"""
-        # Remove common prefixes/suffixes and normalize
-        normalized = name.lower().strip()
-        
-        # Remove articles and common cooking terms
-        remove_words = ['fresh', 'dried', 'ground', 'whole', 'chopped', 'diced', 'minced']
-        for word in remove_words:
-            normalized = re.sub(rf'\b{word}\b', '', normalized)
-        
-        # Remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        return _normalize_name(name)
     
     def _calculate_ingredient_similarity(self, name1: str, name2: str) -> float:
         """Calculate similarity between two ingredient names"""
-        name1_normalized = self._normalize_ingredient_name(name1)
-        name2_normalized = self._normalize_ingredient_name(name2)
-        
-        # Exact match
-        if name1_normalized == name2_normalized:
-            return 1.0
-        
-        # Check if one contains the other
-        if name1_normalized in name2_normalized or name2_normalized in name1_normalized:
-            return 0.9
-        
-        # Word overlap scoring
-        words1 = set(name1_normalized.split())
-        words2 = set(name2_normalized.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        overlap = len(words1 & words2)
-        total = len(words1 | words2)
+        return self._normalized_similarity(
+            self._normalize_ingredient_name(name1),
+            self._normalize_ingredient_name(name2)
+        )
+    
+    def _blocking_keys(self, normalized_name: str) -> Set[str]:
+        """
+        Keys shared by any two normalized names that can score above zero.
         
-        return overlap / total if total > 0 else 0.0
+        Word overlap needs a shared word, and containment or equality of names
+        with at least 3 characters needs a shared character trigram.
+        """
+        keys = {f"w:{word}" for word in normalized_name.split()}
+        keys.update(f"t:{normalized_name[k:k + 3]}" for k in range(len(normalized_name) - 2))
+        return keys
+    
+    def _normalized_similarity(self, name1_normalized: str, name2_normalized: str) -> float:
+        """Calculate similarity between two already-normalized ingredient names"""
+        # Similarity is symmetric, so order the pair to share cache entries
+        if name1_normalized > name2_normalized:
+            name1_normalized, name2_normalized = name2_normalized, name1_normalized
+        return _pair_similarity(name1_normalized, name2_normalized)
     
     def _load_category_keywords(self) -> Dict[str, List[str]]:
         """Load category keyword mappings for auto-categorization"""
@@ -551,28 +644,62 @@ class IngredientService:
             ]
         }
     
+    def _compile_category_matcher(self) -> Tuple[re.Pattern, Dict[str, Tuple[int, str]]]:
+        """
+        Compile all category keywords into one regex for single-pass matching.
+        
+        The lookahead reports a match at every position, and alternatives are
+        ordered by category so each position yields its highest-priority keyword.
+        """
+        keyword_categories: Dict[str, Tuple[int, str]] = {}
+        for priority, (category, keywords) in enumerate(self._category_keywords.items()):
+            for keyword in keywords:
+                keyword_categories.setdefault(keyword, (priority, category))
+        
+        ordered = sorted(keyword_categories, key=lambda kw: keyword_categories[kw][0])
+        pattern = re.compile('(?=(' + '|'.join(re.escape(kw) for kw in ordered) + '))')
+        return pattern, keyword_categories
+    
     def _is_cache_valid(self) -> bool:
         """Check if ingredient cache is still valid"""
-        if not self._cache_timestamp or not self._ingredient_cache:
-            return False
-        
-        cache_age = (datetime.now() - self._cache_timestamp).total_seconds()
-        return cache_age < self._cache_ttl_seconds
+        return bool(self._ingredient_cache) and time.monotonic() < self._cache_deadline
     
     def _update_cache(self, ingredients: List[Ingredient]):
         """Update ingredient cache"""
         self._ingredient_cache = {ing.id: ing for ing in ingredients}
-        self._cache_timestamp = datetime.now()
+        cached = tuple(self._ingredient_cache.values())
+        self._cache_columns = (cached, tuple(self._normalize_ingredient_name(ing.name) for ing in cached))
+        self._cache_deadline = time.monotonic() + self._cache_ttl_seconds
+    
+    def _get_name_columns(self) -> Tuple[Tuple[Ingredient, ...], Tuple[str, ...]]:
+        """Get cached ingredients with their normalized names, refreshing the cache if stale"""
+        if not self._is_cache_valid():
+            self._update_cache(self.db.get_all_ingredients())
+        return self._cache_columns
     
     def _invalidate_cache(self):
         """Invalidate ingredient cache"""
         self._ingredient_cache.clear()
-        self._cache_timestamp = None
+        self._cache_columns = ((), ())
+        self._cache_deadline = 0.0
+        
+        # Writes here bypass the database service, so drop its read caches too
+        # (recipes included, since deletes and merges rewrite recipe_ingredients)
+        if hasattr(self.db, 'invalidate_caches'):
+            self.db.invalidate_caches()
+
+
+# Global ingredient service instance with threading lock
+_ingredient_service: Optional[IngredientService] = None
+_service_lock = threading.Lock()
 
 
 def get_ingredient_service(database_service: Optional[DatabaseService] = None) -> IngredientService:
-    """Get singleton ingredient service instance"""
+    """Get singleton ingredient service instance (thread-safe)"""
     global _ingredient_service
-    if '_ingredient_service' not in globals():
-        globals()['_ingredient_service'] = IngredientService(database_service)
-    return globals()['_ingredient_service']
\ No newline at end of file
+    if _ingredient_service is None:
+        with _service_lock:
+            # Double-check locking pattern
+            if _ingredient_service is None:
+                _ingredient_service = IngredientService(database_service)
+    return _ingredient_service
\ No newline at end of file
@@ -6,12 +6,15 @@ with available ingredients. Core functionality for "what can I make" feature.
 """
 
 import logging
-from typing import List, Optional, Dict, Set, Tuple, Any
+import time
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, List, Optional, Dict, Set, FrozenSet, Tuple, Any
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from models.recipe_models import Recipe, Ingredient, RecipeIngredient
-from services.database_service import DatabaseService, get_database_service
+from models.recipe_models import Recipe, RecipeIngredient
+from services.database_service import DatabaseService, get_database_service, SQLITE_MAX_PARAMS
 from utils import get_logger
 
 logger = get_logger(__name__)
@@ -36,11 +39,33 @@ class PantryItem:
 class RecipeMatch:
     """Recipe with ingredient match analysis"""
     recipe: Recipe
-    available_ingredients: List[str]  # ingredients user has
-    missing_ingredients: List[str]   # ingredients user needs
+    available_ingredient_ids: FrozenSet[int]  # ingredients user has
+    missing_ingredient_ids: FrozenSet[int]    # ingredients user needs
     match_percentage: float          # percentage of ingredients available
     can_make: bool                   # True if all required ingredients available
     difficulty_score: float          # How hard to make (missing key ingredients)
+    # {id: (name, category)} used to resolve names on first access
+    ingredient_index: Dict[int, Tuple[str, str]] = field(default_factory=dict, repr=False, compare=False)
+    _names: Dict[str, List[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def _resolve_names(self, key: str, ingredient_ids: FrozenSet[int]) -> List[str]:
+        """Map ingredient IDs to names once and remember the result"""
+        names = self._names.get(key)
+        if names is None:
+            index = self.ingredient_index
+            names = [index[i][0] if i in index else f"Unknown({i})" for i in ingredient_ids]
+            self._names[key] = names
+        return names
+    
+    @property
+    def available_ingredients(self) -> List[str]:
+        """Names of the ingredients user has"""
+        return self._resolve_names('available', self.available_ingredient_ids)
+    
+    @property
+    def missing_ingredients(self) -> List[str]:
+        """Names of the ingredients user needs"""
+        return self._resolve_names('missing', self.missing_ingredient_ids)
     
     @property
     def match_status(self) -> str:
@@ -65,14 +90,44 @@ class PantryService:
     - Smart ingredient suggestions and shopping lists
     """
     
+    # Missing ingredients in these categories make a recipe harder to complete
+    _CRITICAL_CATEGORIES = frozenset({'protein', 'oil', 'dairy'})
+    
+    # Insert a pantry item or update it in place if the user already has it
+    _UPSERT_PANTRY_SQL = """
+        INSERT INTO user_pantry (user_id, ingredient_id, is_available, quantity_estimate, last_updated)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, ingredient_id) DO UPDATE SET
+            is_available = excluded.is_available,
+            quantity_estimate = excluded.quantity_estimate,
+            last_updated = excluded.last_updated
+    """
+    
     def __init__(self, database_service: Optional[DatabaseService] = None):
         self.db = database_service or get_database_service()
+        
+        # Pantry reads cached per user as (deadline, items, available IDs); writes drop the entry
+        self._pantry_cache: Dict[int, Tuple[float, List[PantryItem], FrozenSet[int]]] = {}
+        self._pantry_cache_ttl_seconds = 30
+    
+    def invalidate_pantry_cache(self, user_id: Optional[int] = None):
+        """Drop cached pantry reads (all users when no ID is given)"""
+        if user_id is None:
+            self._pantry_cache.clear()
+        else:
+            self._pantry_cache.pop(user_id, None)
     
     def get_user_pantry(self, user_id: int) -> List[PantryItem]:
         """Get user's complete pantry inventory"""
+        cached = self._pantry_cache.get(user_id)
+        if cached and time.monotonic() < cached[0]:
+            return list(cached[1])
+        
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
+                # Plain tuples in a fixed column order are cheaper to build and unpack than Rows
+                cursor.row_factory = None
                 
                 # Get user's pantry items with ingredient details
                 cursor.execute("""
@@ -82,27 +137,30 @@ class PantryService:
                         i.category,
                         p.is_available,
                         p.quantity_estimate,
-                        p.last_updated
+                        p.last_updated AS "last_updated [datetime]"
                     FROM user_pantry p
                     JOIN ingredients i ON p.ingredient_id = i.id
                     WHERE p.user_id = ?
                     ORDER BY i.category, i.name
                 """, (user_id,))
                 
-                rows = cursor.fetchall()
                 pantry_items = []
                 
-                for row in rows:
+                for ingredient_id, name, category, is_available, quantity_estimate, last_updated in cursor:
                     pantry_items.append(PantryItem(
-                        ingredient_id=row['ingredient_id'],
-                        ingredient_name=row['name'],
-                        category=row['category'],
-                        is_available=bool(row['is_available']),
-                        quantity_estimate=row['quantity_estimate'],
-                        last_updated=datetime.fromisoformat(row['last_updated']) if row['last_updated'] else datetime.now()
+                        ingredient_id=ingredient_id,
+                        ingredient_name=name,
+                        category=category,
+                        is_available=bool(is_available),
+                        quantity_estimate=quantity_estimate,
+                        last_updated=last_updated or datetime.now()
                     ))
                 
-                return pantry_items
+                available_ids = frozenset(item.ingredient_id for item in pantry_items if item.is_available)
+                self._pantry_cache[user_id] = (
+                    time.monotonic() + self._pantry_cache_ttl_seconds, pantry_items, available_ids
+                )
+                return list(pantry_items)
                 
         except Exception as e:
             logger.error(f"Failed to get user pantry: {e}")
@@ -113,38 +171,17 @@ class PantryService:
         """Update availability of pantry item"""
         try:
             with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Check if pantry item exists
-                cursor.execute("""
-                    SELECT user_id FROM user_pantry 
-                    WHERE user_id = ? AND ingredient_id = ?
-                """, (user_id, ingredient_id))
-                
-                if cursor.fetchone():
-                    # Update existing item
-                    cursor.execute("""
-                        UPDATE user_pantry SET
-                            is_available = ?,
-                            quantity_estimate = ?,
-                            last_updated = ?
-                        WHERE user_id = ? AND ingredient_id = ?
-                    """, (is_available, quantity_estimate, datetime.now(), user_id, ingredient_id))
-                else:
-                    # Create new pantry item
-                    cursor.execute("""
-                        INSERT INTO user_pantry (user_id, ingredient_id, is_available, quantity_estimate, last_updated)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (user_id, ingredient_id, is_available, quantity_estimate, datetime.now()))
+                conn.execute(self._UPSERT_PANTRY_SQL,
+                             (user_id, ingredient_id, is_available, quantity_estimate, datetime.now()))
                 
                 conn.commit()
+                self.invalidate_pantry_cache(user_id)
                 logger.info(f"Updated pantry item {ingredient_id} for user {user_id}: available={is_available}")
                 return True
                 
         except Exception as e:
-            logger.error(f"Failed to update pantry item {ingredient_id} for user {user_id}: {e}")
-            import traceback
-            logger.error(f"Pantry update traceback: {traceback.format_exc()}")
+            # logger.exception attaches the traceback without formatting it up front
+            logger.exception(f"Failed to update pantry item {ingredient_id} for user {user_id}: {e}")
             return False
     
     def add_common_ingredients_to_pantry(self, user_id: int, categories: List[str] = None) -> int:
@@ -163,20 +200,33 @@ class PantryService:
             if categories is None:
                 categories = list(common_ingredients.keys())
             
-            added_count = 0
+            wanted = [
+                (ingredient_name, category)
+                for category in categories if category in common_ingredients
+                for ingredient_name in common_ingredients[category]
+            ]
             
-            for category in categories:
-                if category not in common_ingredients:
-                    continue
-                    
-                for ingredient_name in common_ingredients[category]:
-                    # Find or create ingredient
-                    ingredient = self._find_or_create_ingredient(ingredient_name, category)
-                    if ingredient:
-                        # Add to pantry as available
-                        if self.update_pantry_item(user_id, ingredient.id, True, "plenty"):
-                            added_count += 1
+            with self.db.get_connection() as conn:
+                # Take the write lock up front: the batch reads before it writes,
+                # and a deferred transaction could fail to upgrade mid-way
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                
+                ingredient_ids = self._find_or_create_ingredient_ids(conn, wanted)
+                
+                # Add everything to the pantry as available in the same transaction
+                now = datetime.now()
+                pantry_rows = [(user_id, ingredient_id, True, "plenty", now)
+                               for ingredient_id in dict.fromkeys(ingredient_ids.values())]
+                conn.executemany(self._UPSERT_PANTRY_SQL, pantry_rows)
+                conn.commit()
+            added_count = len(pantry_rows)
             
+            # New ingredients were inserted behind the database service's back
+            if hasattr(self.db, 'invalidate_ingredient_cache'):
+                self.db.invalidate_ingredient_cache()
+            
+            self.invalidate_pantry_cache(user_id)
             logger.info(f"Added {added_count} common ingredients to user {user_id}'s pantry")
             return added_count
             
@@ -185,7 +235,8 @@ class PantryService:
             return 0
     
     def find_makeable_recipes(self, user_id: int, strict_mode: bool = True,
-                             include_partial_matches: bool = False) -> List[RecipeMatch]:
+                             include_partial_matches: bool = False,
+                             max_missing: Optional[int] = None) -> List[RecipeMatch]:
         """
         Find recipes that can be made with current pantry items.
         
@@ -193,56 +244,55 @@ class PantryService:
             user_id: User ID
             strict_mode: If True, require ALL ingredients. If False, allow missing 1-2 items
             include_partial_matches: Include recipes with <50% ingredient matches
+            max_missing: Skip recipes missing more than this many ingredients
         """
         try:
             # Get user's available ingredients
-            pantry = self.get_user_pantry(user_id)
-            available_ingredients = {
-                item.ingredient_id for item in pantry if item.is_available
-            }
+            available_ingredients = self._get_available_ingredient_set(user_id)
             
             if not available_ingredients:
                 logger.info(f"User {user_id} has no available ingredients")
                 return []
             
-            # Get all recipes with their ingredients
-            recipes = self._get_recipes_with_ingredients(user_id)
+            # The match threshold is applied in SQL, so only qualifying recipes are loaded
+            if strict_mode:
+                min_match = 1.0
+            elif not include_partial_matches:
+                min_match = 0.5
+            else:
+                min_match = 0.0
+            
+            recipes = self._get_recipes_with_ingredients(user_id, min_match, max_missing)
+            ingredient_index = self._load_ingredient_index(
+                ingredient_id for recipe, _, _, _ in recipes for ingredient_id in recipe.required_ingredient_ids
+            )
+            critical_ids = frozenset(
+                ingredient_id for ingredient_id, (_, category) in ingredient_index.items()
+                if category in self._CRITICAL_CATEGORIES
+            )
             recipe_matches = []
             
-            for recipe, recipe_ingredients in recipes:
-                required_ingredient_ids = {ri.ingredient_id for ri in recipe_ingredients}
-                
-                # Calculate match
-                available_in_recipe = available_ingredients.intersection(required_ingredient_ids)
-                missing_in_recipe = required_ingredient_ids - available_ingredients
-                
-                if not required_ingredient_ids:  # Recipe with no ingredients
-                    continue
-                    
-                match_percentage = len(available_in_recipe) / len(required_ingredient_ids)
-                can_make = len(missing_in_recipe) == 0
-                
-                # Apply filtering based on mode
-                if strict_mode and not can_make:
-                    continue
-                    
-                if not include_partial_matches and match_percentage < 0.5:
-                    continue
+            for recipe, recipe_ingredients, availability, counts in recipes:
+                # Counts and per-ingredient availability come from the query
+                available_in_recipe, missing_in_recipe = availability
+                required_count, available_count = counts
+                match_percentage = available_count / required_count
+                can_make = available_count == required_count
                 
                 # Calculate difficulty score (higher = more difficult)
-                difficulty_score = self._calculate_difficulty_score(recipe_ingredients, missing_in_recipe)
-                
-                # Get ingredient names
-                available_names = [self._get_ingredient_name(ing_id) for ing_id in available_in_recipe]
-                missing_names = [self._get_ingredient_name(ing_id) for ing_id in missing_in_recipe]
+                difficulty_score = self._calculate_difficulty_score(
+                    recipe_ingredients, missing_in_recipe, critical_ids
+                )
                 
+                # Ingredient names are resolved lazily, only for matches that get displayed
                 recipe_match = RecipeMatch(
                     recipe=recipe,
-                    available_ingredients=available_names,
-                    missing_ingredients=missing_names,
+                    available_ingredient_ids=available_in_recipe,
+                    missing_ingredient_ids=missing_in_recipe,
                     match_percentage=match_percentage,
                     can_make=can_make,
-                    difficulty_score=difficulty_score
+                    difficulty_score=difficulty_score,
+                    ingredient_index=ingredient_index
                 )
                 
                 recipe_matches.append(recipe_match)
@@ -260,26 +310,30 @@ class PantryService:
     def get_shopping_list(self, user_id: int, recipe_ids: List[int]) -> Dict[str, List[str]]:
         """Generate shopping list for selected recipes"""
         try:
-            pantry = self.get_user_pantry(user_id)
-            available_ingredients = {item.ingredient_id for item in pantry if item.is_available}
+            available_ingredients = self._get_available_ingredient_set(user_id)
+            ingredients_by_recipe = [self._get_recipe_ingredients(recipe_id) for recipe_id in recipe_ids]
+            ingredient_index = self._load_ingredient_index(
+                ri.ingredient_id for recipe_ingredients in ingredients_by_recipe
+                for ri in recipe_ingredients if ri.ingredient_id not in available_ingredients
+            )
             
             shopping_list = {}
+            seen_items = set()  # (category, item_text) already listed
             
-            for recipe_id in recipe_ids:
-                recipe_ingredients = self._get_recipe_ingredients(recipe_id)
-                
+            for recipe_ingredients in ingredients_by_recipe:
                 for ri in recipe_ingredients:
                     if ri.ingredient_id not in available_ingredients:
-                        ingredient_name = self._get_ingredient_name(ri.ingredient_id)
-                        category = self._get_ingredient_category(ri.ingredient_id)
-                        
-                        if category not in shopping_list:
-                            shopping_list[category] = []
+                        ingredient_name, category = self._lookup_ingredient(ingredient_index, ri.ingredient_id)
                         
                         # Format with quantity
                         item_text = f"{ri.get_display_text()} {ingredient_name}"
-                        if item_text not in shopping_list[category]:
-                            shopping_list[category].append(item_text)
+                        if (category, item_text) in seen_items:
+                            continue
+                        seen_items.add((category, item_text))
+                        
+                        if category not in shopping_list:
+                            shopping_list[category] = []
+                        shopping_list[category].append(item_text)
             
             return shopping_list
             
@@ -290,21 +344,18 @@ class PantryService:
     def suggest_recipes_to_complete_pantry(self, user_id: int, max_missing: int = 2) -> List[RecipeMatch]:
         """Suggest recipes that need just a few more ingredients"""
         try:
-            # Get partial matches with missing ingredients
+            # Get partial matches missing just a few ingredients
             partial_matches = self.find_makeable_recipes(
                 user_id, 
                 strict_mode=False, 
-                include_partial_matches=True
+                include_partial_matches=True,
+                max_missing=max_missing
             )
             
-            # Filter to recipes missing just a few ingredients
-            suggestions = [
-                match for match in partial_matches
-                if len(match.missing_ingredients) <= max_missing and not match.can_make
-            ]
+            suggestions = [match for match in partial_matches if not match.can_make]
             
             # Sort by fewest missing ingredients first
-            suggestions.sort(key=lambda x: (len(x.missing_ingredients), -x.match_percentage))
+            suggestions.sort(key=lambda x: (len(x.missing_ingredient_ids), -x.match_percentage))
             
             return suggestions[:10]  # Top 10 suggestions
             
@@ -331,26 +382,93 @@ class PantryService:
     
     # Helper methods
     
-    def _get_recipes_with_ingredients(self, user_id: int) -> List[Tuple[Recipe, List[RecipeIngredient]]]:
-        """Get all recipes with their ingredient lists"""
+    def _get_available_ingredient_set(self, user_id: int) -> FrozenSet[int]:
+        """Get IDs of the user's available pantry ingredients, shared through the pantry cache"""
+        cached = self._pantry_cache.get(user_id)
+        if cached and time.monotonic() < cached[0]:
+            return cached[2]
+        
+        pantry = self.get_user_pantry(user_id)
+        cached = self._pantry_cache.get(user_id)
+        if cached:
+            return cached[2]
+        # Entry was dropped by a concurrent write (or the read failed)
+        return frozenset(item.ingredient_id for item in pantry if item.is_available)
+    
+    def _get_recipes_with_ingredients(self, user_id: int,
+                                      min_match: float = 0.0, max_missing: Optional[int] = None
+                                      ) -> List[Tuple[Recipe, List[RecipeIngredient],
+                                                      Tuple[FrozenSet[int], FrozenSet[int]], Tuple[int, int]]]:
+        """
+        Get recipes where at least min_match of the ingredients are in the pantry
+        (and at most max_missing are not), with their ingredient lists, the
+        (available, missing) ingredient IDs and the (required, available) counts
+        """
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Get all accessible recipes
+                # Accessible recipes meeting the pantry match threshold and their
+                # ingredients in one pass, each flagged with pantry availability;
+                # ri_* aliases keep the junction columns apart from recipe columns
                 cursor.execute("""
-                    SELECT * FROM recipes
-                    WHERE is_public = 1 OR created_by = ?
-                    ORDER BY name
-                """, (user_id,))
+                    WITH pantry AS (
+                        SELECT ingredient_id FROM user_pantry
+                        WHERE user_id = ? AND is_available = 1
+                    ),
+                    matches AS (
+                        SELECT recipe_id,
+                            COUNT(*) AS required,
+                            SUM(ingredient_id IN (SELECT ingredient_id FROM pantry)) AS available
+                        FROM recipe_ingredients
+                        GROUP BY recipe_id
+                    )
+                    SELECT r.*,
+                        m.required AS match_required,
+                        m.available AS match_available,
+                        ri.ingredient_id AS ri_ingredient_id,
+                        ri.quantity AS ri_quantity,
+                        ri.unit AS ri_unit,
+                        ri.preparation_note AS ri_preparation_note,
+                        ri.ingredient_order AS ri_ingredient_order,
+                        ri.ingredient_id IN (SELECT ingredient_id FROM pantry) AS ri_in_pantry
+                    FROM matches m
+                    JOIN recipes r ON r.id = m.recipe_id
+                    JOIN recipe_ingredients ri ON ri.recipe_id = r.id
+                    WHERE (r.is_public = 1 OR r.created_by = ?)
+                        AND m.available >= m.required * ?
+                        AND (? IS NULL OR m.required - m.available <= ?)
+                    ORDER BY r.name, r.id, ri.ingredient_order
+                """, (user_id, user_id, min_match, max_missing, max_missing))
                 
                 recipes = []
-                for row in cursor.fetchall():
-                    recipe = self.db._row_to_recipe(row)
+                for recipe_id, rows in groupby(cursor, key=itemgetter('id')):
+                    rows = list(rows)
+                    recipe = self.db._row_to_recipe(rows[0])
                     
-                    # Get recipe ingredients
-                    recipe_ingredients = self._get_recipe_ingredients(recipe.id)
-                    recipes.append((recipe, recipe_ingredients))
+                    recipe_ingredients = [
+                        RecipeIngredient(
+                            recipe_id=recipe_id,
+                            ingredient_id=row['ri_ingredient_id'],
+                            quantity=row['ri_quantity'],
+                            unit=row['ri_unit'],
+                            preparation_note=row['ri_preparation_note'],
+                            ingredient_order=row['ri_ingredient_order']
+                        )
+                        for row in rows
+                    ]
+                    recipe.ingredients = recipe_ingredients
+                    recipe.required_ingredient_ids = frozenset(ri.ingredient_id for ri in recipe_ingredients)
+                    
+                    # Split on the per-row pantry flag rather than diffing sets afterwards
+                    available_ids = []
+                    missing_ids = []
+                    for row in rows:
+                        (available_ids if row['ri_in_pantry'] else missing_ids).append(row['ri_ingredient_id'])
+                    
+                    availability = (frozenset(available_ids), frozenset(missing_ids))
+                    counts = (rows[0]['match_required'], rows[0]['match_available'])
+                    recipes.append((recipe, recipe_ingredients, availability, counts))
                 
                 return recipes
                 
@@ -363,25 +481,34 @@ class PantryService:
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None
                 
                 cursor.execute("""
-                    SELECT * FROM recipe_ingredients
+                    SELECT ingredient_id, quantity, unit, preparation_note, ingredient_order
+                    FROM recipe_ingredients
                     WHERE recipe_id = ?
                     ORDER BY ingredient_order
                 """, (recipe_id,))
                 
-                ingredients = []
-                for row in cursor.fetchall():
-                    ingredients.append(self.db._row_to_recipe_ingredient(row))
-                
-                return ingredients
+                return [
+                    RecipeIngredient(
+                        recipe_id=recipe_id,
+                        ingredient_id=ingredient_id,
+                        quantity=quantity,
+                        unit=unit,
+                        preparation_note=preparation_note,
+                        ingredient_order=ingredient_order
+                    )
+                    for ingredient_id, quantity, unit, preparation_note, ingredient_order in cursor
+                ]
                 
         except Exception as e:
             logger.error(f"Failed to get recipe ingredients: {e}")
             return []
     
     def _calculate_difficulty_score(self, recipe_ingredients: List[RecipeIngredient], 
-                                  missing_ingredient_ids: Set[int]) -> float:
+                                  missing_ingredient_ids: Set[int],
+                                  critical_ids: FrozenSet[int]) -> float:
         """Calculate how difficult a recipe is based on missing ingredients"""
         if not missing_ingredient_ids:
             return 0.0
@@ -390,55 +517,53 @@ class PantryService:
         base_score = len(missing_ingredient_ids)
         
         # Adjust based on ingredient types (proteins/oils more critical)
-        critical_categories = ['protein', 'oil', 'dairy']
-        critical_missing = 0
-        
-        for ingredient_id in missing_ingredient_ids:
-            category = self._get_ingredient_category(ingredient_id)
-            if category in critical_categories:
-                critical_missing += 1
+        critical_missing = len(critical_ids.intersection(missing_ingredient_ids))
         
         # Higher score = more difficult
         return base_score + (critical_missing * 0.5)
     
-    def _find_or_create_ingredient(self, name: str, category: str) -> Optional[Ingredient]:
-        """Find existing ingredient or create new one"""
-        try:
-            # Search for existing ingredient
-            ingredients = self.db.search_ingredients(name)
-            exact_match = next((ing for ing in ingredients if ing.name.lower() == name.lower()), None)
-            
-            if exact_match:
-                return exact_match
-            
-            # Create new ingredient
-            new_ingredient = self.db.create_ingredient(name, category)
-            if new_ingredient:
-                return new_ingredient
-            
-            # If creation failed due to constraint, search again (race condition)
-            ingredients = self.db.search_ingredients(name)
-            exact_match = next((ing for ing in ingredients if ing.name.lower() == name.lower()), None)
-            if exact_match:
-                logger.debug(f"Ingredient {name} was created by another thread")
-                return exact_match
-            
-            logger.warning(f"Failed to find or create ingredient: {name}")
-            return None
-            
-        except Exception as e:
-            logger.error(f"Failed to find/create ingredient {name}: {e}")
-            return None
+    def _find_or_create_ingredient_ids(self, conn, wanted: List[Tuple[str, str]]) -> Dict[str, int]:
+        """Resolve (name, category) pairs to ingredient IDs by lowercase name, creating missing ones"""
+        def lookup(names: List[str]) -> Dict[str, int]:
+            placeholders = ','.join('?' * len(names))
+            cursor = conn.execute(
+                f"SELECT lower(name), id FROM ingredients WHERE lower(name) IN ({placeholders})", names
+            )
+            return dict(cursor.fetchall())
+        
+        ingredient_ids = lookup([name.lower() for name, _ in wanted]) if wanted else {}
+        missing = [(name, category) for name, category in wanted if name.lower() not in ingredient_ids]
+        if missing:
+            conn.executemany("INSERT OR IGNORE INTO ingredients (name, category) VALUES (?, ?)", missing)
+            ingredient_ids.update(lookup([name.lower() for name, _ in missing]))
+        
+        unresolved = [name for name, _ in wanted if name.lower() not in ingredient_ids]
+        if unresolved:
+            logger.warning(f"Failed to find or create ingredients: {unresolved}")
+        return ingredient_ids
     
-    def _get_ingredient_name(self, ingredient_id: int) -> str:
-        """Get ingredient name by ID"""
-        ingredient = self.db.get_ingredient_by_id(ingredient_id)
-        return ingredient.name if ingredient else f"Unknown({ingredient_id})"
+    def _load_ingredient_index(self, ingredient_ids: Iterable[int]) -> Dict[int, Tuple[str, str]]:
+        """Load (name, category) for the given ingredients, keyed by ID"""
+        ids = list(set(ingredient_ids))
+        index = {}
+        if not ids:
+            return index
+        
+        with self.db.get_connection() as conn:
+            for start in range(0, len(ids), SQLITE_MAX_PARAMS):
+                chunk = ids[start:start + SQLITE_MAX_PARAMS]
+                cursor = conn.execute(
+                    f"SELECT id, name, category FROM ingredients WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                index.update((row[0], (row[1], row[2])) for row in cursor)
+        return index
     
-    def _get_ingredient_category(self, ingredient_id: int) -> str:
-        """Get ingredient category by ID"""
-        ingredient = self.db.get_ingredient_by_id(ingredient_id)
-        return ingredient.category if ingredient else "unknown"
+    @staticmethod
+    def _lookup_ingredient(ingredient_index: Dict[int, Tuple[str, str]], ingredient_id: int) -> Tuple[str, str]:
+        """Get (name, category) for an ingredient ID from a preloaded index"""
+        entry = ingredient_index.get(ingredient_id)
+        return entry if entry else (f"Unknown({ingredient_id})", "unknown")
 
 
 # Global service instance
@@ -7,9 +7,10 @@ with recipe-specific data handling and ingredient categorization.
 """
 
 import re
+import bisect
 import logging
+import functools
 from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime
 from dataclasses import asdict
 
 from models import ScrapedRecipe, ParsedRecipe, ValidationResult, Ingredient
@@ -18,6 +19,129 @@ from utils import get_logger
 
 logger = get_logger(__name__)
 
+# Patterns compiled once at import rather than looked up in the re cache per call
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Trailing "Recipe", optionally followed by "- sitename.com" or "| Site Name",
+# removed in one pass
+_TITLE_SUFFIX_RE = re.compile(
+    r'(?:\s*recipe)?(?:\s*-\s*[^-]+\.com|\s*\|\s*[^|]+)?\s*$', re.IGNORECASE
+)
+
+_STEP_PERIOD_RE = re.compile(r'(\d+)\s*([^.!?])')
+_STEP_BREAK_RE = re.compile(r'(\.)(\s*)(\d+)')
+
+# Every time format in one alternation, scanned once with finditer: ISO 8601
+# durations (PT1H30M), hours, minutes, clock times (1:30) and bare numbers.
+# Clock times are a lookahead so "2:30 min" still yields the "30 min" token
+_TIME_TOKEN_RE = re.compile(
+    r'(?P<iso>pt(?:(?P<iso_h>\d+)h)?(?:(?P<iso_m>\d+)m)?)'
+    r'|(?P<h>\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h\b)'
+    r'|(?P<m>\d+)\s*(?:minutes?|mins?|m\b)'
+    r'|(?=(?P<ch>\d+):(?P<cm>\d+))'
+    r'|\b(?P<d>\d+)\b'
+)
+_WORD_NUMBER_RE = re.compile(r'\b(\d+)\b')
+_FIRST_NUMBER_RE = re.compile(r'(\d+)')
+
+# Quantity + unit + remainder, handling mixed fractions, decimals and ranges
+_QUANTITY_UNIT_RE = re.compile(
+    r'^(\d+(?:\s+\d+/\d+|\.\d+|/\d+)?(?:\s*-\s*\d+(?:\s+\d+/\d+|\.\d+|/\d+)?)?)\s+([a-zA-Z-]+(?:\s+[a-zA-Z-]+)*?)\s+(.*)'
+)
+# Quantity + remainder, for cases like "3 large eggs"
+_QUANTITY_ONLY_RE = re.compile(r'^(\d+(?:\s+\d+/\d+|\.\d+|/\d+)?)\s+(.*)')
+
+# Comma-separated preparation words and parenthetical notes in one alternation;
+# the named group says which kind matched so notes keep their original order
+_PREP_RE = re.compile(
+    r',\s*(?:(?P<cut>chopped|diced|sliced|minced|grated|shredded|crushed|ground|softened)'
+    r'|(?P<state>fresh|dried|frozen|canned|room\s+temperature)'
+    r'|(?P<trim>peeled|seeded|stemmed|trimmed|pitted))'
+    r'|\((?P<note>.*?)\)',  # Parenthetical instructions
+    re.IGNORECASE
+)
+_PREP_KIND_ORDER = {'cut': 0, 'state': 1, 'trim': 2, 'note': 3}
+_TRAILING_COMMA_RE = re.compile(r'\s*,\s*$')
+
+# Variation -> normalized name, flattened from the per-cuisine and per-category
+# lists. Dict order follows the lists, so the first hit is the same one the
+# nested scan found
+_CUISINE_LOOKUP = {
+    variation.lower(): normalized
+    for normalized, variations in (
+        ('American', ('American', 'USA', 'US')),
+        ('Italian', ('Italian', 'Italia')),
+        ('Mexican', ('Mexican', 'Mexico')),
+        ('Chinese', ('Chinese', 'China')),
+        ('Indian', ('Indian', 'India')),
+        ('French', ('French', 'France')),
+        ('Thai', ('Thai', 'Thailand')),
+        ('Japanese', ('Japanese', 'Japan')),
+        ('Mediterranean', ('Mediterranean', 'Med')),
+    )
+    for variation in variations
+}
+_MEAL_CATEGORY_LOOKUP = {
+    keyword: category
+    for category, keywords in (
+        ('breakfast', ('breakfast', 'brunch')),
+        ('lunch', ('lunch',)),
+        ('dinner', ('dinner', 'supper', 'main')),
+        ('snack', ('snack', 'appetizer')),
+        ('dessert', ('dessert', 'sweet', 'cake', 'cookie')),
+    )
+    for keyword in keywords
+}
+
+# Size/type words that can sit where a unit would ("2 large eggs")
+_DESCRIPTORS = frozenset({
+    'large', 'medium', 'small', 'extra-large', 'jumbo',
+    'fresh', 'dried', 'frozen', 'canned', 'whole',
+    'lean', 'boneless', 'skinless', 'ground',
+    'ripe', 'green', 'red', 'yellow', 'white',
+    'thick', 'thin', 'fine', 'coarse'
+})
+
+# Unit alias -> normalized unit name
+_UNIT_LOOKUP = {
+    alias: normalized
+    for normalized, aliases in (
+        # Volume
+        ('cup', ('cup', 'cups', 'c')),
+        ('tablespoon', ('tablespoon', 'tablespoons', 'tbsp', 'tbs')),
+        ('teaspoon', ('teaspoon', 'teaspoons', 'tsp')),
+        ('liter', ('liter', 'liters', 'l', 'litre', 'litres')),
+        ('milliliter', ('milliliter', 'milliliters', 'ml')),
+        ('fluid-ounce', ('fl-oz', 'fl oz', 'fluid ounce')),
+        
+        # Weight
+        ('pound', ('pound', 'pounds', 'lb', 'lbs')),
+        ('ounce', ('ounce', 'ounces', 'oz')),
+        ('gram', ('gram', 'grams', 'g')),
+        ('kilogram', ('kilogram', 'kilograms', 'kg')),
+        
+        # Count
+        ('piece', ('piece', 'pieces', 'pc', 'pcs')),
+        ('item', ('item', 'items')),
+        ('clove', ('clove', 'cloves')),
+        ('slice', ('slice', 'slices')),
+    )
+    for alias in aliases
+}
+
+# Dietary keywords per tag, checked as plain substrings of the recipe text
+_DIETARY_INDICATORS = (
+    ('vegetarian', ('vegetarian', 'veggie')),
+    ('vegan', ('vegan',)),
+    ('gluten-free', ('gluten-free', 'gluten free', 'gf')),
+    ('dairy-free', ('dairy-free', 'dairy free', 'lactose free')),
+    ('low-carb', ('low-carb', 'low carb', 'keto')),
+    ('high-protein', ('high-protein', 'high protein', 'protein')),
+    ('healthy', ('healthy', 'light', 'nutritious')),
+)
+_MEAT_INDICATORS = ('chicken', 'beef', 'pork', 'fish', 'lamb', 'turkey', 'bacon', 'sausage')
+_DAIRY_INDICATORS = ('milk', 'cheese', 'butter', 'cream', 'yogurt')
+
 
 class ParsingService:
     """
@@ -30,9 +154,6 @@ class ParsingService:
     def __init__(self, database_service: Optional[DatabaseService] = None):
         self.db = database_service or get_database_service()
         
-        # Preload ingredients for matching
-        self._ingredients_cache = self._load_ingredients_cache()
-        
         # Common time units for parsing
         self._time_patterns = self._compile_time_patterns()
         
@@ -119,8 +240,7 @@ class ParsingService:
         else:
             result.validation_notes.append(f"Recipe validation failed with {len(result.get_all_errors())} errors")
         
-        result.validated_at = datetime.now()
-        
+        # validated_at was stamped when the result was created above
         return result
     
     def suggest_ingredient_matches(self, ingredient_text: str, max_suggestions: int = 5) -> List[Tuple[Ingredient, float]]:
@@ -134,36 +254,53 @@ class ParsingService:
         Returns:
             List of (Ingredient, confidence_score) tuples, sorted by confidence
         """
-        ingredient_text = ingredient_text.lower().strip()
+        ranked = self._ranked_matches(ingredient_text.lower().strip())
+        return list(ranked[:max_suggestions])
+    
+    def _rank_ingredient_matches(self, ingredient_text: str) -> Tuple[Tuple[Ingredient, float], ...]:
+        """Score cached ingredients against normalized text, best match first"""
+        input_words = set(ingredient_text.split())
+        
+        # Word overlap can only clear the threshold for ingredients sharing a word,
+        # so the token index supplies those; containment still needs the name pass
+        candidates = {idx for word in input_words for idx in self._token_index.get(word, ())}
+        # A name can only contain the text if it is at least as long, and only
+        # fit inside it if it is no longer, so each side checks one direction
+        names = self._ingredient_names
+        by_length = self._names_by_length
+        text_length = len(ingredient_text)
+        shorter_end = bisect.bisect_right(self._name_lengths, text_length)
+        longer_start = bisect.bisect_left(self._name_lengths, text_length)
+        candidates.update(idx for idx in by_length[:shorter_end] if names[idx] in ingredient_text)
+        candidates.update(idx for idx in by_length[longer_start:] if ingredient_text in names[idx])
+        
+        # Scored inline against the precomputed names: exact match 1.0,
+        # containment 0.8, otherwise word overlap (Jaccard)
         suggestions = []
-        
-        for ingredient in self._ingredients_cache:
-            confidence = self._calculate_ingredient_similarity(ingredient_text, ingredient)
+        for idx in sorted(candidates):
+            name = self._ingredient_names[idx]
+            if ingredient_text == name:
+                confidence = 1.0
+            elif ingredient_text in name or name in ingredient_text:
+                confidence = 0.8
+            else:
+                name_words = self._ing_tokens[idx]
+                confidence = len(input_words & name_words) / len(input_words | name_words)
             if confidence > 0.3:  # Minimum confidence threshold
-                suggestions.append((ingredient, confidence))
+                suggestions.append((self._ingredients_cache[idx], confidence))
         
         # Sort by confidence score, descending
         suggestions.sort(key=lambda x: x[1], reverse=True)
         
-        return suggestions[:max_suggestions]
+        return tuple(suggestions)
     
     def _clean_title(self, title: str) -> str:
         """Clean and normalize recipe title"""
         if not title:
             return ""
         
-        # Remove extra whitespace
-        cleaned = re.sub(r'\s+', ' ', title.strip())
-        
-        # Remove common recipe site suffixes
-        suffixes_to_remove = [
-            r'\s*-\s*[^-]+\.com$',  # - sitename.com
-            r'\s*|\s*[^|]+$',      # | Site Name
-            r'\s*recipe\s*$',       # Recipe (case insensitive)
-        ]
-        
-        for pattern in suffixes_to_remove:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        # Collapse whitespace, then remove common recipe site suffixes
+        cleaned = _TITLE_SUFFIX_RE.sub('', _WHITESPACE_RE.sub(' ', title.strip()))
         
         return cleaned.strip()
     
@@ -173,7 +310,7 @@ class ParsingService:
             return ""
         
         # Remove extra whitespace and normalize
-        cleaned = re.sub(r'\s+', ' ', description.strip())
+        cleaned = _WHITESPACE_RE.sub(' ', description.strip())
         
         # Limit length to reasonable size
         if len(cleaned) > 500:
@@ -187,13 +324,13 @@ class ParsingService:
             return ""
         
         # Normalize whitespace
-        cleaned = re.sub(r'\s+', ' ', instructions.strip())
+        cleaned = _WHITESPACE_RE.sub(' ', instructions.strip())
         
         # Add periods after numbered steps if missing
-        cleaned = re.sub(r'(\d+)\s*([^.!?])', r'\1. \2', cleaned)
+        cleaned = _STEP_PERIOD_RE.sub(r'\1. \2', cleaned)
         
         # Ensure steps are separated by newlines
-        cleaned = re.sub(r'(\.)(\s*)(\d+)', r'\1\n\2\3', cleaned)
+        cleaned = _STEP_BREAK_RE.sub(r'\1\n\2\3', cleaned)
         
         return cleaned
     
@@ -204,42 +341,55 @@ class ParsingService:
         
         time_text = time_text.lower().strip()
         
-        # Check for ISO 8601 duration format (PT15M, PT1H30M)
-        iso_match = re.search(r'pt(?:(\d+)h)?(?:(\d+)m)?', time_text)
-        if iso_match:
-            hours = int(iso_match.group(1) or 0)
-            minutes = int(iso_match.group(2) or 0)
-            return hours * 60 + minutes
+        # Blank and bare-number fields are common; answer them without the regex
+        if not time_text:
+            return 0
+        if time_text.isdecimal():
+            value = int(time_text)
+            return value if value <= 180 else 0
+        
+        # First match of each kind, collected in a single scan
+        hours_text = minutes_text = clock_match = digits_text = None
+        for match in _TIME_TOKEN_RE.finditer(time_text):
+            kind = match.lastgroup
+            if kind == 'iso':
+                # ISO 8601 duration format (PT15M, PT1H30M) wins outright
+                return int(match.group('iso_h') or 0) * 60 + int(match.group('iso_m') or 0)
+            if kind == 'h':
+                hours_text = hours_text or match.group('h')
+            elif kind == 'm':
+                minutes_text = minutes_text or match.group('m')
+            elif kind == 'cm':
+                clock_match = clock_match or match
+            elif digits_text is None:
+                digits_text = match.group('d')
         
         # Parse various time formats
         total_minutes = 0
         
-        # Hours
-        hour_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h\b)', time_text)
-        if hour_match:
-            total_minutes += int(float(hour_match.group(1)) * 60)
+        if hours_text:
+            total_minutes += int(float(hours_text) * 60)
         
-        # Minutes
-        min_match = re.search(r'(\d+)\s*(?:minutes?|mins?|m\b)', time_text)
-        if min_match:
-            total_minutes += int(min_match.group(1))
+        if minutes_text:
+            total_minutes += int(minutes_text)
         
         # Time format like "1:30" (hour:minute)
-        time_format_match = re.search(r'(\d+):(\d+)', time_text)
-        if time_format_match and total_minutes == 0:
-            hours = int(time_format_match.group(1))
-            minutes = int(time_format_match.group(2))
-            total_minutes = hours * 60 + minutes
+        if clock_match and total_minutes == 0:
+            total_minutes = int(clock_match.group('ch')) * 60 + int(clock_match.group('cm'))
         
         # Just digits (assume minutes if reasonable, hours if large)
         if total_minutes == 0:
-            digit_match = re.search(r'\b(\d+)\b', time_text)
-            if digit_match:
-                value = int(digit_match.group(1))
-                if value <= 180:  # Assume minutes if <= 3 hours
-                    total_minutes = value
-                elif value <= 12:  # Assume hours if reasonable
-                    total_minutes = value * 60
+            if hours_text or minutes_text or clock_match:
+                # Zero-valued tokens above may have consumed the first number
+                digit_match = _WORD_NUMBER_RE.search(time_text)
+                digits_text = digit_match.group(1) if digit_match else None
+        
+        if total_minutes == 0 and digits_text:
+            value = int(digits_text)
+            if value <= 180:  # Assume minutes if <= 3 hours
+                total_minutes = value
+            elif value <= 12:  # Assume hours if reasonable
+                total_minutes = value * 60
         
         return total_minutes
     
@@ -248,8 +398,12 @@ class ParsingService:
         if not servings_text:
             return 1
         
+        if servings_text.isdecimal():
+            servings = int(servings_text)
+            return servings if 1 <= servings <= 50 else 1
+        
         # Extract first number found
-        match = re.search(r'(\d+)', servings_text)
+        match = _FIRST_NUMBER_RE.search(servings_text)
         if match:
             servings = int(match.group(1))
             # Reasonable range check
@@ -280,20 +434,9 @@ class ParsingService:
         cuisine_text = cuisine_text.strip().title()
         
         # Normalize common variations
-        cuisine_mapping = {
-            'American': ['American', 'USA', 'US'],
-            'Italian': ['Italian', 'Italia'],
-            'Mexican': ['Mexican', 'Mexico'],
-            'Chinese': ['Chinese', 'China'],
-            'Indian': ['Indian', 'India'],
-            'French': ['French', 'France'],
-            'Thai': ['Thai', 'Thailand'],
-            'Japanese': ['Japanese', 'Japan'],
-            'Mediterranean': ['Mediterranean', 'Med'],
-        }
-        
-        for normalized, variations in cuisine_mapping.items():
-            if any(var.lower() in cuisine_text.lower() for var in variations):
+        lowered = cuisine_text.lower()
+        for variation, normalized in _CUISINE_LOOKUP.items():
+            if variation in lowered:
                 return normalized
         
         return cuisine_text
@@ -305,16 +448,8 @@ class ParsingService:
         
         category_text = category_text.lower()
         
-        category_mapping = {
-            'breakfast': ['breakfast', 'brunch'],
-            'lunch': ['lunch'],
-            'dinner': ['dinner', 'supper', 'main'],
-            'snack': ['snack', 'appetizer'],
-            'dessert': ['dessert', 'sweet', 'cake', 'cookie'],
-        }
-        
-        for category, keywords in category_mapping.items():
-            if any(keyword in category_text for keyword in keywords):
+        for keyword, category in _MEAL_CATEGORY_LOOKUP.items():
+            if keyword in category_text:
                 return category
         
         return ""
@@ -323,54 +458,40 @@ class ParsingService:
         """Extract dietary tags from recipe content"""
         tags = []
         
-        # Combine all text for analysis
-        all_text = " ".join([
-            scraped_recipe.title.lower(),
-            scraped_recipe.description.lower(),
-            scraped_recipe.instructions_raw.lower(),
-            " ".join(scraped_recipe.ingredients_raw).lower()
-        ])
+        # Combine all text for analysis, case-folding each part exactly once; the
+        # lowered ingredient text is reused for the ingredient-based checks below
+        ingredient_text = " ".join(scraped_recipe.ingredients_raw).lower()
+        all_text = (
+            f"{scraped_recipe.title} {scraped_recipe.description} {scraped_recipe.instructions_raw} ".lower()
+            + ingredient_text
+        )
         
         # Check for dietary indicators
-        dietary_indicators = {
-            'vegetarian': ['vegetarian', 'veggie'],
-            'vegan': ['vegan'],
-            'gluten-free': ['gluten-free', 'gluten free', 'gf'],
-            'dairy-free': ['dairy-free', 'dairy free', 'lactose free'],
-            'low-carb': ['low-carb', 'low carb', 'keto'],
-            'high-protein': ['high-protein', 'high protein', 'protein'],
-            'healthy': ['healthy', 'light', 'nutritious'],
-        }
-        
-        for tag, indicators in dietary_indicators.items():
+        for tag, indicators in _DIETARY_INDICATORS:
             if any(indicator in all_text for indicator in indicators):
                 tags.append(tag)
         
         # Ingredient-based detection
-        ingredient_text = " ".join(scraped_recipe.ingredients_raw).lower()
-        
         # Check for meat indicators
-        meat_indicators = ['chicken', 'beef', 'pork', 'fish', 'lamb', 'turkey', 'bacon', 'sausage']
-        has_meat = any(meat in ingredient_text for meat in meat_indicators)
+        has_meat = any(meat in ingredient_text for meat in _MEAT_INDICATORS)
         
         if not has_meat and 'vegetarian' not in tags:
             # Could be vegetarian - but don't auto-add, let user decide
             pass
         
         # Check for dairy
-        dairy_indicators = ['milk', 'cheese', 'butter', 'cream', 'yogurt']
-        has_dairy = any(dairy in ingredient_text for dairy in dairy_indicators)
+        has_dairy = any(dairy in ingredient_text for dairy in _DAIRY_INDICATORS)
         
         if not has_dairy and 'dairy-free' not in tags:
             # Could be dairy-free
             pass
         
-        return list(set(tags))  # Remove duplicates
+        return tags  # Each tag is appended at most once, in table order
     
     def _parse_ingredients(self, ingredients_raw: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
         """Parse raw ingredient strings into structured data"""
         parsed_ingredients = []
-        ingredient_matches = {}
+        named_ingredients = []
         
         for i, ingredient_text in enumerate(ingredients_raw):
             if not ingredient_text.strip():
@@ -380,70 +501,71 @@ class ParsingService:
             parsed_ingredient = self._parse_single_ingredient(ingredient_text, i + 1)
             parsed_ingredients.append(parsed_ingredient)
             
-            # Find potential matches in database
-            ingredient_name = parsed_ingredient.get('name', '').lower()
+            ingredient_name = parsed_ingredient.get('name', '').lower().strip()
             if ingredient_name:
-                matches = self.suggest_ingredient_matches(ingredient_name, max_suggestions=3)
-                if matches:
-                    ingredient_matches[ingredient_text] = [ing.name for ing, _ in matches]
+                named_ingredients.append((ingredient_text, ingredient_name))
+        
+        # Find potential matches in database for the whole recipe at once,
+        # ranking each distinct name a single time
+        rankings = {name: self._ranked_matches(name) for _, name in named_ingredients}
+        
+        ingredient_matches = {}
+        for ingredient_text, ingredient_name in named_ingredients:
+            matches = rankings[ingredient_name][:3]
+            if matches:
+                ingredient_matches[ingredient_text] = [ing.name for ing, _ in matches]
         
         return parsed_ingredients, ingredient_matches
     
     def _parse_single_ingredient(self, ingredient_text: str, order: int) -> Dict[str, Any]:
         """Parse a single ingredient string into components"""
         original_text = ingredient_text.strip()
+        quantity = 0.0
+        unit = ''
         
-        # Initialize result
-        result = {
-            'original_text': original_text,
-            'quantity': 0.0,
-            'unit': '',
-            'name': '',
-            'preparation': '',
-            'optional': False,
-            'order': order
-        }
-        
-        # Check for optional indicators
-        if any(indicator in original_text.lower() for indicator in ['optional', '(optional)', 'to taste']):
-            result['optional'] = True
+        # Check for optional indicators ('(optional)' is covered by 'optional')
+        lowered = original_text.lower()
+        optional = 'optional' in lowered or 'to taste' in lowered
         
-        # Improved regex for quantity + unit parsing
-        # Handle mixed fractions, decimals, and ranges
-        quantity_pattern = r'^(\d+(?:\s+\d+/\d+|\.\d+|/\d+)?(?:\s*-\s*\d+(?:\s+\d+/\d+|\.\d+|/\d+)?)?)\s+([a-zA-Z-]+(?:\s+[a-zA-Z-]+)*?)\s+(.*)'
-        
-        # Try main pattern first
-        match = re.match(quantity_pattern, original_text)
+        # Try main quantity + unit pattern first
+        match = _QUANTITY_UNIT_RE.match(original_text)
         
         if match:
             quantity_str, unit_str, remainder = match.groups()
             
             # Parse quantity
-            result['quantity'] = self._parse_quantity(quantity_str.strip())
+            quantity = self._parse_quantity(quantity_str.strip())
             
             # Check if unit is actually a descriptor (size/type)
             unit_clean = unit_str.strip().lower()
             if self._is_descriptor_not_unit(unit_clean):
                 # This is a descriptor, not a unit - include it with the ingredient name
-                result['unit'] = ''
-                result['name'], result['preparation'] = self._parse_ingredient_name_and_prep(f"{unit_str} {remainder}".strip())
+                name, preparation = self._parse_ingredient_name_and_prep(f"{unit_str} {remainder}".strip())
             else:
-                result['unit'] = self._normalize_unit(unit_clean)
-                result['name'], result['preparation'] = self._parse_ingredient_name_and_prep(remainder.strip())
+                unit = self._normalize_unit(unit_clean)
+                name, preparation = self._parse_ingredient_name_and_prep(remainder.strip())
         else:
             # Try simpler pattern for cases like "3 large eggs" or "salt to taste"
-            simple_pattern = r'^(\d+(?:\s+\d+/\d+|\.\d+|/\d+)?)\s+(.*)'
-            simple_match = re.match(simple_pattern, original_text)
+            simple_match = _QUANTITY_ONLY_RE.match(original_text)
             
             if simple_match:
                 quantity_str, remainder = simple_match.groups()
-                result['quantity'] = self._parse_quantity(quantity_str.strip())
-                result['name'], result['preparation'] = self._parse_ingredient_name_and_prep(remainder.strip())
+                quantity = self._parse_quantity(quantity_str.strip())
+                name, preparation = self._parse_ingredient_name_and_prep(remainder.strip())
             else:
                 # No quantity found - treat as ingredient name only
-                result['name'], result['preparation'] = self._parse_ingredient_name_and_prep(original_text)
+                name, preparation = self._parse_ingredient_name_and_prep(original_text)
         
-        return result
+        # Built in one go once every field is known
+        return {
+            'original_text': original_text,
+            'quantity': quantity,
+            'unit': unit,
+            'name': name,
+            'preparation': preparation,
+            'optional': optional,
+            'order': order
+        }
     
     def _parse_quantity(self, quantity_str: str) -> float:
         """Parse quantity string to float"""
@@ -475,104 +597,28 @@ class ParsingService:
     
     def _is_descriptor_not_unit(self, text: str) -> bool:
         """Check if text is a size/type descriptor rather than a measurement unit"""
-        descriptors = {
-            'large', 'medium', 'small', 'extra-large', 'jumbo',
-            'fresh', 'dried', 'frozen', 'canned', 'whole',
-            'lean', 'boneless', 'skinless', 'ground',
-            'ripe', 'green', 'red', 'yellow', 'white',
-            'thick', 'thin', 'fine', 'coarse'
-        }
-        return text in descriptors
+        return text in _DESCRIPTORS
     
     def _normalize_unit(self, unit_str: str) -> str:
         """Normalize measurement unit"""
         unit_str = unit_str.lower()
         
-        unit_mapping = {
-            # Volume
-            'cup': ['cup', 'cups', 'c'],
-            'tablespoon': ['tablespoon', 'tablespoons', 'tbsp', 'tbs'],
-            'teaspoon': ['teaspoon', 'teaspoons', 'tsp'],
-            'liter': ['liter', 'liters', 'l', 'litre', 'litres'],
-            'milliliter': ['milliliter', 'milliliters', 'ml'],
-            'fluid-ounce': ['fl-oz', 'fl oz', 'fluid ounce'],
-            
-            # Weight
-            'pound': ['pound', 'pounds', 'lb', 'lbs'],
-            'ounce': ['ounce', 'ounces', 'oz'],
-            'gram': ['gram', 'grams', 'g'],
-            'kilogram': ['kilogram', 'kilograms', 'kg'],
-            
-            # Count
-            'piece': ['piece', 'pieces', 'pc', 'pcs'],
-            'item': ['item', 'items'],
-            'clove': ['clove', 'cloves'],
-            'slice': ['slice', 'slices'],
-        }
-        
-        for normalized, variations in unit_mapping.items():
-            if unit_str in variations:
-                return normalized
-        
-        return unit_str
+        return _UNIT_LOOKUP.get(unit_str, unit_str)
     
     def _parse_ingredient_name_and_prep(self, text: str) -> Tuple[str, str]:
         """Parse ingredient name and preparation instructions"""
-        # Common preparation indicators
-        prep_patterns = [
-            r',\s*(chopped|diced|sliced|minced|grated|shredded|crushed|ground|softened)',
-            r',\s*(fresh|dried|frozen|canned|room\s+temperature)',
-            r',\s*(peeled|seeded|stemmed|trimmed|pitted)',
-            r'\((.*?)\)',  # Parenthetical instructions
-        ]
-        
-        name = text
-        preparations = []
-        
-        for pattern in prep_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                # Handle nested matches from parentheses
-                for match in matches:
-                    if isinstance(match, str):
-                        preparations.append(match.strip())
-                    else:
-                        # This handles tuple results from groups
-                        preparations.extend([m.strip() for m in match if m.strip()])
-                
-                # Remove matched preparation from name
-                name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+        matches = sorted(_PREP_RE.finditer(text), key=lambda m: _PREP_KIND_ORDER[m.lastgroup])
+        preparations = [match.group(match.lastgroup).strip() for match in matches]
+        
+        # Remove matched preparation from name
+        name = _PREP_RE.sub('', text) if matches else text
         
         # Clean up name - remove extra commas and whitespace
-        name = re.sub(r'\s*,\s*$', '', name.strip())
-        name = re.sub(r'\s+', ' ', name)
+        name = _TRAILING_COMMA_RE.sub('', name.strip())
+        name = _WHITESPACE_RE.sub(' ', name)
         
         return name, ', '.join(preparations) if preparations else ''
     
-    def _calculate_ingredient_similarity(self, input_text: str, ingredient: Ingredient) -> float:
-        """Calculate similarity between input text and database ingredient"""
-        input_text = input_text.lower()
-        ingredient_name = ingredient.name.lower()
-        
-        # Exact match
-        if input_text == ingredient_name:
-            return 1.0
-        
-        # Check if one contains the other
-        if input_text in ingredient_name or ingredient_name in input_text:
-            return 0.8
-        
-        # Word overlap scoring
-        input_words = set(input_text.split())
-        ingredient_words = set(ingredient_name.split())
-        
-        if input_words and ingredient_words:
-            overlap = len(input_words & ingredient_words)
-            total = len(input_words | ingredient_words)
-            return overlap / total if total > 0 else 0.0
-        
-        return 0.0
-    
     def _identify_parsing_issues(self, scraped_recipe: ScrapedRecipe, parsed_recipe: ParsedRecipe):
         """Identify potential parsing issues that need review"""
         # Check for missing essential data
@@ -644,6 +690,33 @@ class ParsingService:
             logger.error(f"Failed to load ingredients cache: {e}")
             return []
     
+    @functools.cached_property
+    def _ingredients_cache(self) -> List[Ingredient]:
+        """Ingredients for matching, read from the database on first use"""
+        return self._load_ingredients_cache()
+    
+    @functools.cached_property
+    def _ranked_matches(self):
+        """Memoized _rank_ingredient_matches, built with the word index on first use"""
+        self._build_ingredient_index()
+        # Common names recur across recipes; created alongside the index so a
+        # reload never serves rankings from the old ingredient list
+        return functools.lru_cache(maxsize=4096)(self._rank_ingredient_matches)
+    
+    def _build_ingredient_index(self):
+        """Index cached ingredient names by their lowercase words"""
+        self._ingredient_names = [ingredient.name.lower() for ingredient in self._ingredients_cache]
+        self._ing_tokens = [frozenset(name.split()) for name in self._ingredient_names]
+        self._token_index: Dict[str, List[int]] = {}
+        for idx, tokens in enumerate(self._ing_tokens):
+            for token in tokens:
+                self._token_index.setdefault(token, []).append(idx)
+        
+        # Name positions ordered by length, for the containment prefilter
+        self._names_by_length = sorted(range(len(self._ingredient_names)),
+                                       key=lambda idx: len(self._ingredient_names[idx]))
+        self._name_lengths = [len(self._ingredient_names[idx]) for idx in self._names_by_length]
+    
     def _compile_time_patterns(self) -> Dict[str, str]:
         """Compile regex patterns for time parsing"""
         return {
@@ -662,9 +735,13 @@ class ParsingService:
         }
 
 
+# Global service instance
+_parsing_service: Optional[ParsingService] = None
+
+
 def get_parsing_service(database_service: Optional[DatabaseService] = None) -> ParsingService:
     """Get singleton parsing service instance"""
     global _parsing_service
-    if '_parsing_service' not in globals():
-        globals()['_parsing_service'] = ParsingService(database_service)
-    return globals()['_parsing_service']
+    if _parsing_service is None:
+        _parsing_service = ParsingService(database_service)
+    return _parsing_service
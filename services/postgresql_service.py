@@ -6,11 +6,21 @@ Replaces SQLite for production deployment and consistent local development.
 """
 
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
-import json
+import psycopg2.pool
+import copy
+import csv
+import io
 import logging
+import itertools
 import os
-from typing import List, Optional, Dict, Set, Tuple, Any
+import re
+import threading
+import time
+import weakref
+from typing import Iterable, List, Optional, Dict, Set, Tuple, Any
+from collections import defaultdict
 from contextlib import contextmanager
 from datetime import datetime
 import streamlit as st
@@ -19,9 +29,155 @@ from models import (
     Recipe, Ingredient, RecipeIngredient, User, UserPreferences, 
     Collection, UserSession, NutritionData
 )
+from utils.json_utils import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+# Rows per execute_values page; multi-row INSERTs stop getting faster past this
+BULK_INSERT_PAGE_SIZE = 1000
+
+# Rows per round trip when streaming full-table reads through a server-side cursor
+STREAM_FETCH_SIZE = 1000
+
+# Connection pools shared by every service instance, keyed by database URL.
+# Streamlit reruns create new service objects, so pools must outlive them
+_connection_pools: Dict[str, psycopg2.pool.ThreadedConnectionPool] = {}
+_pool_lock = threading.Lock()
+
+
+def _get_connection_pool(database_url: str) -> psycopg2.pool.ThreadedConnectionPool:
+    """Get the shared connection pool for a database URL, creating it on first use"""
+    pool = _connection_pools.get(database_url)
+    if pool is None:
+        with _pool_lock:
+            # Double-check locking pattern
+            pool = _connection_pools.get(database_url)
+            if pool is None:
+                pool = psycopg2.pool.ThreadedConnectionPool(
+                    1, int(os.getenv('PG_POOL_MAX', '16')), database_url,
+                    cursor_factory=psycopg2.extras.RealDictCursor
+                )
+                _connection_pools[database_url] = pool
+    return pool
+
+
+# Version of the DDL in _ensure_schema_exists. Bump it whenever that DDL
+# changes; databases already at this version skip the DDL on startup
+SCHEMA_VERSION = 1
+
+# Advisory lock key serializing schema setup across processes starting together
+_SCHEMA_LOCK_KEY = 0x70616e73
+
+# Seconds a process reuses the full ingredient list. Writes through this
+# service invalidate it at once; the TTL bounds how long writes made by
+# other processes go unseen
+INGREDIENT_LIST_TTL_SECONDS = float(os.getenv('PG_INGREDIENT_CACHE_TTL', '300'))
+
+# Cached ingredient rows keyed by database URL, as (expires_at, version, rows).
+# Module level for the same reason as the pools; the version is bumped on
+# every ingredient write so an in-flight read cannot store stale rows. Rows
+# rather than models are kept so each caller gets objects of its own
+_ingredient_list_cache: Dict[str, Tuple[float, int, List[tuple]]] = {}
+_ingredient_list_versions: Dict[str, int] = defaultdict(int)
+
+# Decode JSONB columns with the shared JSON helpers (orjson when installed)
+# instead of psycopg2's default stdlib json.loads
+psycopg2.extras.register_default_jsonb(globally=True, loads=json_loads)
+
+# Model reads use plain tuple rows rather than the pool's RealDictCursor,
+# skipping a dict allocation per row
+_TUPLE_CURSOR = psycopg2.extensions.cursor
+
+# Server-side prepared statements live in a database session. PgBouncer in
+# transaction pooling mode moves transactions between sessions, so set
+# PGBOUNCER=1 there to run these queries as plain statements instead
+_USE_PREPARED_STATEMENTS = os.getenv('PGBOUNCER') != '1'
+
+# Columns the Ingredient and Recipe models are built from. Selecting only
+# these keeps timestamps and legacy recipe columns off the wire, and their
+# fixed order lets the row converters read plain tuples positionally
+_INGREDIENT_COLUMNS = "id, name, category, common_substitutes, storage_tips, nutritional_data"
+_RECIPE_COLUMNS = (
+    "id, name, description, instructions, prep_time_minutes, cook_time_minutes, "
+    "servings, nutritional_info, source_url"
+)
+
+# Hot lookups run through PREPARE/EXECUTE: name -> (parameter types, query)
+_PREPARED_QUERIES = {
+    'get_ingredient_by_id': ('integer', f"SELECT {_INGREDIENT_COLUMNS} FROM ingredients WHERE id = %s"),
+    'get_ingredient_by_name': ('text', f"SELECT {_INGREDIENT_COLUMNS} FROM ingredients WHERE name = %s"),
+    'search_ingredients': ('text', f"SELECT {_INGREDIENT_COLUMNS} FROM ingredients WHERE name ILIKE %s ORDER BY name"),
+    'get_recipe_by_id': ('integer', f"SELECT {_RECIPE_COLUMNS} FROM recipes WHERE id = %s"),
+    'get_recipe_ingredient_ids': ('integer', "SELECT ingredient_id FROM recipe_ingredients WHERE recipe_id = %s"),
+    # Recipe plus its ingredient IDs as one array column, in a single round trip
+    'get_recipe_with_ingredient_ids': ('integer', (
+        f"SELECT {_RECIPE_COLUMNS}, "
+        "ARRAY(SELECT ingredient_id FROM recipe_ingredients WHERE recipe_id = recipes.id) "
+        "FROM recipes WHERE id = %s"
+    )),
+}
+
+# Fixed query text for the other reads and writes. Each query shape is one
+# constant, picked between rather than assembled per call, so the text is
+# identical every time it reaches the server
+_SQL_GET_ALL_INGREDIENTS = f"SELECT {_INGREDIENT_COLUMNS} FROM ingredients ORDER BY name"
+_SQL_GET_ALL_RECIPES = f"SELECT {_RECIPE_COLUMNS} FROM recipes ORDER BY created_at DESC"
+_SQL_GET_ALL_RECIPES_LIMIT = _SQL_GET_ALL_RECIPES + " LIMIT %s"
+_SQL_GET_RECIPES_BY_IDS = f"SELECT {_RECIPE_COLUMNS} FROM recipes WHERE id = ANY(%s)"
+_SQL_GET_INGREDIENT_IDS_FOR_RECIPES = (
+    "SELECT recipe_id, ingredient_id FROM recipe_ingredients WHERE recipe_id = ANY(%s)"
+)
+# Returns no row when the name already exists; the caller then looks it up
+_SQL_CREATE_INGREDIENT = f"""
+    INSERT INTO ingredients (name, category, common_substitutes, storage_tips, nutritional_data)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (name) DO NOTHING
+    RETURNING {_INGREDIENT_COLUMNS}
+"""
+_SQL_CREATE_RECIPE = f"""
+    INSERT INTO recipes (
+        name, description, instructions, prep_time_minutes, cook_time_minutes,
+        servings, difficulty_level, cuisine_type, meal_category, dietary_tags,
+        nutritional_info, created_by, source_url, confidence_score
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    RETURNING {_RECIPE_COLUMNS}
+"""
+# execute_values expands the single VALUES %s into the rows of each page
+_SQL_INSERT_RECIPE_INGREDIENTS = """
+    INSERT INTO recipe_ingredients (
+        recipe_id, ingredient_id, quantity, unit, preparation_note, ingredient_order, is_optional
+    ) VALUES %s
+    ON CONFLICT (recipe_id, ingredient_id) DO NOTHING
+"""
+_SQL_UPSERT_PANTRY_ITEMS = """
+    INSERT INTO user_pantry (user_id, ingredient_id, is_available, quantity_available, unit)
+    VALUES %s
+    ON CONFLICT (user_id, ingredient_id)
+    DO UPDATE SET
+        is_available = EXCLUDED.is_available,
+        quantity_available = EXCLUDED.quantity_available,
+        last_updated = CURRENT_TIMESTAMP
+"""
+_SQL_UPSERT_PANTRY_ITEM = _SQL_UPSERT_PANTRY_ITEMS.replace("VALUES %s", "VALUES (%s, %s, %s, %s, %s)")
+
+# Statement names already prepared on each pooled connection
+_prepared_statements: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def _numbered_placeholders(sql: str) -> str:
+    """Rewrite psycopg2 %s placeholders as PREPARE's $1, $2, ..."""
+    counter = itertools.count(1)
+    return re.sub(r'%s', lambda match: f"${next(counter)}", sql)
+
+
+def _json_column(value) -> Dict[str, Any]:
+    """Normalize a JSONB column value; the driver usually returns it already decoded"""
+    if not value or value == '{}':
+        return {}
+    if isinstance(value, (str, bytes)):
+        return json_loads(value)
+    return value
+
 
 class PostgreSQLService:
     """
@@ -64,7 +220,7 @@ class PostgreSQLService:
         """Test database connection"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
+                cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
                 cursor.execute("SELECT 1")
                 result = cursor.fetchone()
                 if result[0] == 1:
@@ -77,26 +233,73 @@ class PostgreSQLService:
     
     @contextmanager
     def get_connection(self):
-        """Get database connection with automatic cleanup"""
+        """Borrow a pooled database connection, returning it to the pool on exit"""
+        pool = _get_connection_pool(self.database_url)
         conn = None
         try:
-            conn = psycopg2.connect(
-                self.database_url,
-                cursor_factory=psycopg2.extras.RealDictCursor
-            )
+            conn = pool.getconn()
             yield conn
         except Exception as e:
-            if conn:
-                conn.rollback()
             logger.error(f"Database operation failed: {e}")
             raise
         finally:
             if conn:
-                conn.close()
+                # Roll back whatever is still open (a failed write, or a read-only
+                # transaction) so the connection is not parked "idle in transaction";
+                # this is a no-op when nothing is open
+                try:
+                    if not conn.closed:
+                        conn.rollback()
+                except psycopg2.Error:
+                    conn.close()
+                pool.putconn(conn, close=bool(conn.closed))
+    
+    @contextmanager
+    def transaction(self, synchronous_commit: bool = True):
+        """
+        Yield a cursor whose statements all commit together when the block exits.
+        
+        Any exception rolls the whole block back. Pass synchronous_commit=False
+        for data that can be re-created (imports, seeds) to skip waiting for
+        the WAL flush at commit.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
+            if not synchronous_commit:
+                cursor.execute("SET LOCAL synchronous_commit TO OFF")
+            yield cursor
+            conn.commit()
+    
+    def _execute_prepared(self, cursor, name: str, params: tuple):
+        """Execute a hot query, preparing it once per pooled connection"""
+        param_types, sql = _PREPARED_QUERIES[name]
+        if not _USE_PREPARED_STATEMENTS:
+            cursor.execute(sql, params)
+            return
+        
+        prepared = _prepared_statements.setdefault(cursor.connection, set())
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} ({param_types}) AS {_numbered_placeholders(sql)}")
+            prepared.add(name)
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    
+    def _schema_version(self, cursor) -> int:
+        """Read the applied schema version, 0 when the database is unversioned"""
+        cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+        if not cursor.fetchone()[0]:
+            return 0
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        return cursor.fetchone()[0]
     
     def _ensure_schema_exists(self):
         """Create database schema if it doesn't exist"""
         schema_sql = """
+        -- Applied schema versions
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
         -- Users table
         CREATE TABLE IF NOT EXISTS users (
             id SERIAL PRIMARY KEY,
@@ -210,81 +413,234 @@ class PostgreSQLService:
         CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_ingredient_id ON recipe_ingredients (ingredient_id);
         CREATE INDEX IF NOT EXISTS idx_collections_user_id ON collections (user_id);
         CREATE INDEX IF NOT EXISTS idx_user_pantry_user_id ON user_pantry (user_id);
-        CREATE INDEX IF NOT EXISTS idx_user_pantry_available ON user_pantry (is_available);
-
-        -- Default admin user
-        INSERT INTO users (email, password_hash, username, first_name, is_verified) 
-        VALUES ('admin@panscookbook.local', 'placeholder_hash', 'admin', 'Administrator', true)
-        ON CONFLICT (email) DO NOTHING;
-
-        -- Default user collection
-        INSERT INTO collections (name, description, user_id, is_favorite)
-        SELECT 'My Favorites', 'Default favorites collection', u.id, true
-        FROM users u WHERE u.username = 'admin'
-        ON CONFLICT DO NOTHING;
+        CREATE INDEX IF NOT EXISTS idx_recipes_created_at ON recipes (created_at DESC);
+
+        -- Pantry reads only ever want available items for one user
+        DROP INDEX IF EXISTS idx_user_pantry_available;
+        CREATE INDEX IF NOT EXISTS idx_user_pantry_user_available ON user_pantry (user_id) WHERE is_available;
+
+        -- Trigram index so search_ingredients' ILIKE '%...%' can avoid a full scan.
+        -- Skipped (with a notice) where the role may not create extensions
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS idx_ingredients_name_trgm ON ingredients USING gin (name gin_trgm_ops);
+        EXCEPTION WHEN insufficient_privilege OR undefined_file OR feature_not_supported THEN
+            RAISE NOTICE 'pg_trgm unavailable, ingredient search is not indexed';
+        END $$;
         """
         
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(schema_sql)
+                cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
+                if self._schema_version(cursor) >= SCHEMA_VERSION:
+                    logger.info(f"PostgreSQL schema is current (version {SCHEMA_VERSION})")
+                    return
+                
+                # Another process may be setting up the same database; wait for
+                # it, then re-check before running the DDL ourselves
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (_SCHEMA_LOCK_KEY,))
+                if self._schema_version(cursor) < SCHEMA_VERSION:
+                    cursor.execute(schema_sql)
+                    self._ensure_admin_user(cursor)
+                    cursor.execute(
+                        "INSERT INTO schema_version (version) VALUES (%s) ON CONFLICT DO NOTHING",
+                        (SCHEMA_VERSION,)
+                    )
                 conn.commit()
-                logger.info("PostgreSQL schema initialized successfully")
+                logger.info(f"PostgreSQL schema initialized successfully (version {SCHEMA_VERSION})")
         except Exception as e:
             logger.error(f"Failed to initialize PostgreSQL schema: {e}")
             raise
     
+    def _ensure_admin_user(self, cursor):
+        """Seed the default admin user and its favorites collection once"""
+        cursor.execute("SELECT 1 FROM users WHERE username = 'admin'")
+        if cursor.fetchone():
+            return
+        
+        cursor.execute("""
+            INSERT INTO users (email, password_hash, username, first_name, is_verified)
+            VALUES ('admin@panscookbook.local', 'placeholder_hash', 'admin', 'Administrator', true)
+            ON CONFLICT (email) DO NOTHING
+            RETURNING id
+        """)
+        admin = cursor.fetchone()
+        if admin:
+            cursor.execute("""
+                INSERT INTO collections (name, description, user_id, is_favorite)
+                VALUES ('My Favorites', 'Default favorites collection', %s, true)
+            """, (admin[0],))
+    
     # Ingredient Methods
     def get_all_ingredients(self) -> List[Ingredient]:
         """Get all ingredients from database"""
+        version = _ingredient_list_versions[self.database_url]
+        cached = _ingredient_list_cache.get(self.database_url)
+        if cached is not None and cached[1] == version and cached[0] > time.monotonic():
+            rows = cached[2]
+        else:
+            try:
+                with self.get_connection() as conn:
+                    with conn.cursor(name='all_ingredients', cursor_factory=_TUPLE_CURSOR) as cursor:
+                        cursor.itersize = STREAM_FETCH_SIZE
+                        cursor.execute(_SQL_GET_ALL_INGREDIENTS)
+                        rows = list(cursor)
+            except Exception as e:
+                logger.error(f"Error loading ingredients: {e}")
+                return []
+            
+            _ingredient_list_cache[self.database_url] = (
+                time.monotonic() + INGREDIENT_LIST_TTL_SECONDS, version, rows
+            )
+        
+        # The decoded nutritional_data dict (last column) is the only mutable
+        # value in a row, so each caller gets its own copy
+        return [self._row_to_ingredient((*row[:-1], copy.deepcopy(row[-1]))) for row in rows]
+    
+    def invalidate_ingredient_cache(self):
+        """Drop the cached ingredient list (use after raw SQL writes outside this service)"""
+        _ingredient_list_versions[self.database_url] += 1
+        _ingredient_list_cache.pop(self.database_url, None)
+    
+    def create_ingredient(self, name: str, category: str = "", **kwargs) -> Optional[Ingredient]:
+        """Create a new ingredient, or return the existing one with that name"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM ingredients ORDER BY name")
-                rows = cursor.fetchall()
-                return [self._row_to_ingredient(row) for row in rows]
+            with self.transaction() as cursor:
+                cursor.execute(_SQL_CREATE_INGREDIENT, (
+                    name,
+                    category,
+                    Ingredient.substitutes_to_db(kwargs.get('common_substitutes', [])),
+                    kwargs.get('storage_tips', ''),
+                    json_dumps(kwargs.get('nutritional_data', {}))
+                ))
+                
+                row = cursor.fetchone()
+                if row is None:
+                    # Name already taken: return the existing ingredient
+                    self._execute_prepared(cursor, 'get_ingredient_by_name', (name,))
+                    return self._row_to_ingredient(cursor.fetchone())
+            
+            self.invalidate_ingredient_cache()
+            return self._row_to_ingredient(row)
+            
         except Exception as e:
-            logger.error(f"Error loading ingredients: {e}")
-            return []
+            logger.error(f"Failed to create ingredient: {e}")
+            return None
     
-    def create_ingredient(self, name: str, category: str = "", **kwargs) -> Optional[Ingredient]:
-        """Create a new ingredient"""
+    def bulk_create_ingredients(self, items: List[Dict[str, Any]],
+                                page_size: int = BULK_INSERT_PAGE_SIZE) -> List[int]:
+        """
+        Create many ingredients in one transaction, returning their IDs in input order.
+        
+        Each item takes the same keys as create_ingredient (name, category,
+        common_substitutes, storage_tips, nutritional_data). Names that already
+        exist are left untouched and their existing IDs are returned.
+        """
+        rows = []
+        for item in items:
+            name = item.get('name', '').strip()
+            if not name:
+                continue
+            rows.append((
+                name,
+                item.get('category', ''),
+                Ingredient.substitutes_to_db(item.get('common_substitutes', [])),
+                item.get('storage_tips', ''),
+                json_dumps(item.get('nutritional_data', {}))
+            ))
+        if not rows:
+            return []
+        
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                inserted = psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO ingredients (name, category, common_substitutes, storage_tips, nutritional_data)
+                    VALUES %s
+                    ON CONFLICT (name) DO NOTHING
+                    RETURNING id, name
+                """, rows, page_size=page_size, fetch=True)
+                ids_by_name = {row['name']: row['id'] for row in inserted}
                 
-                # Check if ingredient already exists
-                cursor.execute("SELECT id FROM ingredients WHERE name = %s", (name,))
-                existing = cursor.fetchone()
+                # Names that already existed are not returned by the INSERT
+                existing = list({row[0] for row in rows} - ids_by_name.keys())
                 if existing:
-                    return self.get_ingredient_by_id(existing['id'])
-                
-                cursor.execute("""
-                    INSERT INTO ingredients (name, category, common_substitutes, storage_tips, nutritional_data)
-                    VALUES (%s, %s, %s, %s, %s) RETURNING id
-                """, (
-                    name,
-                    category,
-                    ','.join(kwargs.get('common_substitutes', [])),
-                    kwargs.get('storage_tips', ''),
-                    json.dumps(kwargs.get('nutritional_data', {}))
-                ))
+                    cursor.execute("SELECT id, name FROM ingredients WHERE name = ANY(%s)", (existing,))
+                    ids_by_name.update((row['name'], row['id']) for row in cursor.fetchall())
                 
-                ingredient_id = cursor.fetchone()['id']
                 conn.commit()
+                if inserted:
+                    self.invalidate_ingredient_cache()
                 
-                return self.get_ingredient_by_id(ingredient_id)
+                logger.info(f"Bulk created ingredients: {len(inserted)} new of {len(rows)} rows")
+                return [ids_by_name[row[0]] for row in rows]
                 
         except Exception as e:
-            logger.error(f"Failed to create ingredient: {e}")
-            return None
+            logger.error(f"Failed to bulk create ingredients: {e}")
+            return []
+    
+    def copy_ingredients(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        Seed ingredients through COPY, returning how many new rows were added.
+        
+        For large imports where IDs are not needed. Rows are streamed into a
+        temporary staging table and merged from there, so names that already
+        exist are skipped just like bulk_create_ingredients.
+        """
+        # Quote every field: in COPY's CSV format an unquoted empty field is NULL
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+        for item in items:
+            name = item.get('name', '').strip()
+            if not name:
+                continue
+            writer.writerow((
+                name,
+                item.get('category', ''),
+                Ingredient.substitutes_to_db(item.get('common_substitutes', [])),
+                item.get('storage_tips', ''),
+                json_dumps(item.get('nutritional_data', {}))
+            ))
+        if not buffer.tell():
+            return 0
+        buffer.seek(0)
+        
+        try:
+            # Seed data can be re-copied, so the commit need not wait for the WAL flush
+            with self.transaction(synchronous_commit=False) as cursor:
+                cursor.execute("""
+                    CREATE TEMP TABLE ingredients_staging (
+                        name TEXT, category TEXT, common_substitutes TEXT,
+                        storage_tips TEXT, nutritional_data JSONB
+                    ) ON COMMIT DROP
+                """)
+                cursor.copy_expert(
+                    "COPY ingredients_staging FROM STDIN WITH (FORMAT csv)", buffer
+                )
+                cursor.execute("""
+                    INSERT INTO ingredients (name, category, common_substitutes, storage_tips, nutritional_data)
+                    SELECT name, category, common_substitutes, storage_tips, nutritional_data
+                    FROM ingredients_staging
+                    ON CONFLICT (name) DO NOTHING
+                """)
+                added = cursor.rowcount
+            
+            if added:
+                self.invalidate_ingredient_cache()
+            logger.info(f"Copied ingredients: {added} new rows")
+            return added
+            
+        except Exception as e:
+            logger.error(f"Failed to copy ingredients: {e}")
+            return 0
     
     def get_ingredient_by_id(self, ingredient_id: int) -> Optional[Ingredient]:
         """Get ingredient by ID"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM ingredients WHERE id = %s", (ingredient_id,))
+                cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
+                self._execute_prepared(cursor, 'get_ingredient_by_id', (ingredient_id,))
                 row = cursor.fetchone()
                 return self._row_to_ingredient(row) if row else None
         except Exception as e:
@@ -295,11 +651,8 @@ class PostgreSQLService:
         """Search ingredients by name"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM ingredients WHERE name ILIKE %s ORDER BY name",
-                    (f"%{query}%",)
-                )
+                cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
+                self._execute_prepared(cursor, 'search_ingredients', (f"%{query}%",))
                 rows = cursor.fetchall()
                 return [self._row_to_ingredient(row) for row in rows]
         except Exception as e:
@@ -311,76 +664,125 @@ class PostgreSQLService:
         """Get all recipes"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                sql = "SELECT * FROM recipes ORDER BY created_at DESC"
-                params = []
-                
                 if limit:
-                    sql += " LIMIT %s"
-                    params.append(limit)
-                
-                cursor.execute(sql, params)
-                rows = cursor.fetchall()
+                    cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
+                    cursor.execute(_SQL_GET_ALL_RECIPES_LIMIT, (limit,))
+                else:
+                    # Unbounded, so stream it rather than materializing every row at once
+                    cursor = conn.cursor(name='all_recipes', cursor_factory=_TUPLE_CURSOR)
+                    cursor.itersize = STREAM_FETCH_SIZE
+                    cursor.execute(_SQL_GET_ALL_RECIPES)
                 
-                recipes = []
-                for row in rows:
-                    recipe = self._row_to_recipe(row)
-                    recipe.required_ingredient_ids = self._get_recipe_ingredient_ids(recipe.id, conn)
-                    recipes.append(recipe)
+                with cursor:
+                    recipes = [self._row_to_recipe(row) for row in cursor]
+                self._attach_ingredient_ids(recipes, conn)
                 
                 return recipes
         except Exception as e:
             logger.error(f"Error loading recipes: {e}")
             return []
     
+    def get_recipes_by_ids(self, recipe_ids: List[int]) -> List[Recipe]:
+        """Get several recipes, with their ingredient IDs, in two queries"""
+        if not recipe_ids:
+            return []
+        
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
+                cursor.execute(_SQL_GET_RECIPES_BY_IDS, (list(recipe_ids),))
+                recipes = [self._row_to_recipe(row) for row in cursor.fetchall()]
+                self._attach_ingredient_ids(recipes, conn)
+                
+                return recipes
+        except Exception as e:
+            logger.error(f"Error loading recipes {recipe_ids}: {e}")
+            return []
+    
     def create_recipe(self, title: str, description: str = "", instructions: str = "", 
                      prep_time_minutes: int = 0, cook_time_minutes: int = 0, 
                      servings: int = 1, difficulty_level: str = "medium",
                      cuisine_type: str = "", meal_category: str = "", 
-                     dietary_tags: str = "", created_by: int = 0, **kwargs) -> Optional[Recipe]:
-        """Create a new recipe"""
+                     dietary_tags: str = "", created_by: int = 0,
+                     ingredients: Optional[List[Dict[str, Any]]] = None, **kwargs) -> Optional[Recipe]:
+        """
+        Create a new recipe, optionally with its ingredient rows.
+        
+        ingredients takes the same items as bulk_create_recipe_ingredients;
+        the recipe and its ingredients are committed in one transaction.
+        """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    INSERT INTO recipes (
-                        name, description, instructions, prep_time_minutes, cook_time_minutes,
-                        servings, difficulty_level, cuisine_type, meal_category, dietary_tags,
-                        nutritional_info, created_by, source_url, confidence_score
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (
+            with self.transaction() as cursor:
+                cursor.execute(_SQL_CREATE_RECIPE, (
                     title, description, instructions, prep_time_minutes, cook_time_minutes,
                     servings, difficulty_level, cuisine_type, meal_category, dietary_tags,
-                    json.dumps(kwargs.get('nutritional_info', {})), created_by,
+                    json_dumps(kwargs.get('nutritional_info', {})), created_by,
                     kwargs.get('source_url', ''), kwargs.get('confidence_score', 1.0)
                 ))
                 
-                recipe_id = cursor.fetchone()['id']
-                conn.commit()
-                
-                return self.get_recipe_by_id(recipe_id)
-                
+                recipe = self._row_to_recipe(cursor.fetchone())
+                if ingredients:
+                    self._insert_recipe_ingredients(cursor, recipe.id, ingredients)
+            
+            recipe.required_ingredient_ids = {item['ingredient_id'] for item in ingredients or ()}
+            return recipe
+            
         except Exception as e:
             logger.error(f"Failed to create recipe: {e}")
             return None
     
+    def bulk_create_recipe_ingredients(self, recipe_id: int, ingredients: List[Dict[str, Any]],
+                                       page_size: int = BULK_INSERT_PAGE_SIZE) -> bool:
+        """
+        Add a recipe's ingredient rows in one multi-row INSERT.
+        
+        Each item needs ingredient_id, quantity and unit, and may carry
+        preparation_note and is_optional; order follows the list.
+        """
+        if not ingredients:
+            return True
+        
+        try:
+            with self.transaction() as cursor:
+                self._insert_recipe_ingredients(cursor, recipe_id, ingredients, page_size)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to add ingredients to recipe {recipe_id}: {e}")
+            return False
+    
+    def _insert_recipe_ingredients(self, cursor, recipe_id: int, ingredients: List[Dict[str, Any]],
+                                   page_size: int = BULK_INSERT_PAGE_SIZE):
+        """Insert a recipe's ingredient rows on an open cursor without committing"""
+        rows = [
+            (
+                recipe_id,
+                ingredient_data['ingredient_id'],
+                ingredient_data['quantity'],
+                ingredient_data['unit'],
+                ingredient_data.get('preparation_note', ''),
+                i + 1,
+                ingredient_data.get('is_optional', False)
+            )
+            for i, ingredient_data in enumerate(ingredients)
+        ]
+        psycopg2.extras.execute_values(cursor, _SQL_INSERT_RECIPE_INGREDIENTS, rows, page_size=page_size)
+    
     def get_recipe_by_id(self, recipe_id: int, include_ingredients: bool = True) -> Optional[Recipe]:
         """Get recipe by ID"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM recipes WHERE id = %s", (recipe_id,))
-                row = cursor.fetchone()
+                cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
+                if not include_ingredients:
+                    self._execute_prepared(cursor, 'get_recipe_by_id', (recipe_id,))
+                    return self._row_to_recipe(cursor.fetchone())
                 
+                self._execute_prepared(cursor, 'get_recipe_with_ingredient_ids', (recipe_id,))
+                row = cursor.fetchone()
                 if not row:
                     return None
                 
-                recipe = self._row_to_recipe(row)
-                if include_ingredients:
-                    recipe.required_ingredient_ids = self._get_recipe_ingredient_ids(recipe.id, conn)
-                
+                recipe = self._row_to_recipe(row[:-1])
+                recipe.required_ingredient_ids = set(row[-1])
                 return recipe
         except Exception as e:
             logger.error(f"Error loading recipe {recipe_id}: {e}")
@@ -393,71 +795,72 @@ class PostgreSQLService:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                stats = {}
-                
-                # Count ingredients
-                cursor.execute("SELECT COUNT(*) FROM ingredients")
-                stats['ingredients'] = cursor.fetchone()[0]
-                
-                # Count recipes
-                cursor.execute("SELECT COUNT(*) FROM recipes")
-                stats['recipes'] = cursor.fetchone()[0]
-                
-                # Count pantry items
-                cursor.execute("SELECT COUNT(*) FROM user_pantry WHERE is_available = true")
-                stats['user_pantry'] = cursor.fetchone()[0]
-                
-                # Count collections
-                cursor.execute("SELECT COUNT(*) FROM collections")
-                stats['collections'] = cursor.fetchone()[0]
-                
-                return stats
+                cursor.execute("""
+                    SELECT
+                        (SELECT COUNT(*) FROM ingredients) AS ingredients,
+                        (SELECT COUNT(*) FROM recipes) AS recipes,
+                        (SELECT COUNT(*) FROM user_pantry WHERE is_available = true) AS user_pantry,
+                        (SELECT COUNT(*) FROM collections) AS collections
+                """)
+                return dict(cursor.fetchone())
         except Exception as e:
             logger.error(f"Error getting database stats: {e}")
             return {}
     
     # Helper Methods
     def _row_to_ingredient(self, row) -> Ingredient:
-        """Convert database row to Ingredient object"""
+        """Convert a tuple row of _INGREDIENT_COLUMNS to an Ingredient object"""
         if not row:
             return None
         
+        ingredient_id, name, category, common_substitutes, storage_tips, nutritional_data = row
         return Ingredient(
-            id=row['id'],
-            name=row['name'],
-            category=row['category'],
-            common_names=[row['name']],  # Simple implementation
-            nutritional_info=json.loads(row['nutritional_data']) if row['nutritional_data'] else {}
+            id=ingredient_id,
+            name=name,
+            category=category,
+            common_substitutes=Ingredient.substitutes_from_db(common_substitutes),
+            storage_tips=storage_tips or '',
+            nutritional_data=_json_column(nutritional_data)
         )
     
     def _row_to_recipe(self, row) -> Recipe:
-        """Convert database row to Recipe object"""
+        """Convert a tuple row of _RECIPE_COLUMNS to a Recipe object"""
         if not row:
             return None
         
+        (recipe_id, name, description, instructions, prep_time_minutes,
+         cook_time_minutes, servings, nutritional_info, source_url) = row
         return Recipe(
-            id=row['id'],
-            name=row['name'],
-            description=row['description'],
-            instructions=row['instructions'],
-            prep_time_minutes=row['prep_time_minutes'],
-            cook_time_minutes=row['cook_time_minutes'],
-            servings=row['servings'],
-            difficulty_level=row['difficulty_level'],
-            cuisine_type=row['cuisine_type'],
-            meal_category=row['meal_category'],
-            dietary_tags=row['dietary_tags'].split(',') if row['dietary_tags'] else [],
-            nutritional_info=json.loads(row['nutritional_info']) if row['nutritional_info'] else {},
-            created_by=row['created_by'],
-            source_url=row['source_url'],
-            confidence_score=row['confidence_score']
+            id=recipe_id,
+            name=name,
+            description=description,
+            instructions=instructions,
+            prep_time_minutes=prep_time_minutes,
+            cook_time_minutes=cook_time_minutes,
+            servings=servings,
+            nutritional_info=_json_column(nutritional_info),
+            source_url=source_url
         )
     
     def _get_recipe_ingredient_ids(self, recipe_id: int, conn) -> Set[int]:
         """Get set of ingredient IDs for a recipe"""
-        cursor = conn.cursor()
-        cursor.execute("SELECT ingredient_id FROM recipe_ingredients WHERE recipe_id = %s", (recipe_id,))
-        return {row['ingredient_id'] for row in cursor.fetchall()}
+        cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
+        self._execute_prepared(cursor, 'get_recipe_ingredient_ids', (recipe_id,))
+        return {row[0] for row in cursor.fetchall()}
+    
+    def _attach_ingredient_ids(self, recipes: List[Recipe], conn):
+        """Set required_ingredient_ids on many recipes with a single query"""
+        if not recipes:
+            return
+        
+        ingredient_ids: Dict[int, Set[int]] = defaultdict(set)
+        cursor = conn.cursor(cursor_factory=_TUPLE_CURSOR)
+        cursor.execute(_SQL_GET_INGREDIENT_IDS_FOR_RECIPES, ([recipe.id for recipe in recipes],))
+        for recipe_id, ingredient_id in cursor.fetchall():
+            ingredient_ids[recipe_id].add(ingredient_id)
+        
+        for recipe in recipes:
+            recipe.required_ingredient_ids = ingredient_ids.get(recipe.id, set())
     
     # Pantry Management Methods (for pantry service compatibility)
     def get_user_pantry(self, user_id: int):
@@ -481,21 +884,41 @@ class PostgreSQLService:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO user_pantry (user_id, ingredient_id, is_available, quantity_available, unit)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (user_id, ingredient_id) 
-                    DO UPDATE SET 
-                        is_available = EXCLUDED.is_available,
-                        quantity_available = EXCLUDED.quantity_available,
-                        last_updated = CURRENT_TIMESTAMP
-                """, (user_id, ingredient_id, is_available, 1.0 if is_available else 0.0, quantity or ''))
+                cursor.execute(_SQL_UPSERT_PANTRY_ITEM, (user_id, ingredient_id, is_available, 1.0 if is_available else 0.0, quantity or ''))
                 conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error updating pantry item: {e}")
             return False
 
+    def bulk_update_pantry(self, user_id: int, items: Iterable[Tuple[int, bool, Optional[str]]],
+                           page_size: int = BULK_INSERT_PAGE_SIZE) -> bool:
+        """
+        Update or insert many pantry items in one multi-row UPSERT and commit.
+
+        Items are (ingredient_id, is_available, quantity) tuples; when an
+        ingredient appears more than once the last entry wins.
+        """
+        # ON CONFLICT cannot touch the same row twice in one statement
+        latest = {ingredient_id: (is_available, quantity)
+                  for ingredient_id, is_available, quantity in items}
+        if not latest:
+            return True
+
+        rows = [
+            (user_id, ingredient_id, is_available, 1.0 if is_available else 0.0, quantity or '')
+            for ingredient_id, (is_available, quantity) in latest.items()
+        ]
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                psycopg2.extras.execute_values(cursor, _SQL_UPSERT_PANTRY_ITEMS, rows, page_size=page_size)
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error updating {len(rows)} pantry items for user {user_id}: {e}")
+            return False
+
 
 # Factory function for dependency injection
 def get_postgresql_service(database_url: str = None) -> PostgreSQLService:
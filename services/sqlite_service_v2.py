@@ -205,6 +205,7 @@ class EnhancedSQLiteService:
         CREATE INDEX IF NOT EXISTS idx_collections_user_id ON collections (user_id);
         CREATE INDEX IF NOT EXISTS idx_user_pantry_user_id ON user_pantry (user_id);
         CREATE INDEX IF NOT EXISTS idx_user_pantry_available ON user_pantry (is_available);
+        CREATE INDEX IF NOT EXISTS idx_user_pantry_user_available ON user_pantry (user_id, is_available, ingredient_id);
 
         -- Default admin user
         INSERT OR IGNORE INTO users (email, password_hash, username, first_name, is_verified) 
@@ -340,7 +341,7 @@ class EnhancedSQLiteService:
                 """, (
                     name,
                     category,
-                    ','.join(kwargs.get('common_substitutes', [])),
+                    Ingredient.substitutes_to_db(kwargs.get('common_substitutes', [])),
                     kwargs.get('storage_tips', ''),
                     json.dumps(kwargs.get('nutritional_data', {}))
                 ))
@@ -531,10 +532,8 @@ class EnhancedSQLiteService:
         if not row:
             return None
         
-        # Parse common_substitutes from database
-        common_substitutes = []
-        if row['common_substitutes']:
-            common_substitutes = row['common_substitutes'].split(',')
+        # Parse common_substitutes from database (JSON array or legacy CSV)
+        common_substitutes = Ingredient.substitutes_from_db(row['common_substitutes'])
         
         return Ingredient(
             id=row['id'],
@@ -633,6 +633,7 @@ class AuthenticationInterface:
                 """, (first_name, last_name, username, user_id))
                 
                 conn.commit()
+                self._invalidate_cached_user(user_id)
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Profile update error: {e}")
@@ -648,6 +649,7 @@ class AuthenticationInterface:
                 """, (preferences.to_json(), user_id))
                 
                 conn.commit()
+                self._invalidate_cached_user(user_id)
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Preferences update error: {e}")
@@ -669,29 +671,11 @@ class AuthenticationInterface:
     def _remove_api_key(self, user: User, service: str) -> bool:
         """Remove API key for service"""
         try:
-            with self.auth.db.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Get current API keys
-                cursor.execute("SELECT api_keys FROM users WHERE id = ?", (user.id,))
-                row = cursor.fetchone()
-                
-                if row and row['api_keys']:
-                    import json
-                    api_keys = json.loads(row['api_keys'])
-                    api_keys.pop(service, None)
-                    
-                    cursor.execute("""
-                        UPDATE users SET api_keys = ? WHERE id = ?
-                    """, (json.dumps(api_keys), user.id))
-                    
-                    conn.commit()
-                    
-                    # Update user object
-                    user.api_keys.pop(service, None)
-                    st.session_state[self.USER_KEY] = user
-                    
-                    return True
+            if self.auth.db.delete_api_key(user.id, service):
+                # Update user object
+                user.api_keys.pop(service, None)
+                st.session_state[self.USER_KEY] = user
+                return True
             
             return False
         except Exception as e:
@@ -716,12 +700,18 @@ class AuthenticationInterface:
                 """, (new_hash, user.id))
                 
                 conn.commit()
+                self._invalidate_cached_user(user.id)
                 return cursor.rowcount > 0
         
         except Exception as e:
             logger.error(f"Password change error: {e}")
             return False
     
+    def _invalidate_cached_user(self, user_id: int):
+        """Drop the database service's cached copy of a user after a direct write"""
+        if hasattr(self.auth.db, 'invalidate_user_cache'):
+            self.auth.db.invalidate_user_cache(user_id)
+    
     def _inject_custom_css(self):
         """Inject custom CSS styling"""
         st.markdown("""
@@ -724,8 +724,11 @@ class RecipeDetailsInterface:
                     ','.join(recipe.dietary_tags), recipe.source_url, nutrition_json,
                     recipe.id
                 ))
+                # Keep the tag lookup table used by search in step with the column
+                self.db._set_recipe_dietary_tags(cursor, recipe.id, recipe.dietary_tags)
                 
                 conn.commit()
+                self._invalidate_cached_recipe(recipe.id)
                 logger.info(f"Updated recipe {recipe.id}: {recipe.name}")
                 return True
                 
@@ -752,6 +755,7 @@ class RecipeDetailsInterface:
                     cursor = conn.cursor()
                     cursor.execute("DELETE FROM recipes WHERE id = ?", (recipe_id,))
                     conn.commit()
+                    self._invalidate_cached_recipe(recipe_id)
                     logger.info(f"Deleted recipe {recipe_id}")
                     return True
             except Exception as e:
@@ -759,6 +763,11 @@ class RecipeDetailsInterface:
                 st.error(f"Failed to delete recipe: {e}")
         return False
     
+    def _invalidate_cached_recipe(self, recipe_id: int):
+        """Drop the database service's cached copy of a recipe after a direct write"""
+        if hasattr(self.db, 'invalidate_recipe_cache'):
+            self.db.invalidate_recipe_cache(recipe_id)
+    
     def _inject_custom_css(self):
         """Inject custom CSS styling for recipe details"""
         st.markdown("""
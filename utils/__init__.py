@@ -6,10 +6,15 @@ Contains helper functions, configuration, and shared utilities.
 
 from .config import Config, get_config
 from .logger import setup_logging, get_logger
+from .json_utils import json_dumps, json_loads, JSONDecodeError, ORJSON_AVAILABLE
 
 __all__ = [
     'Config',
     'get_config', 
     'setup_logging',
-    'get_logger'
+    'get_logger',
+    'json_dumps',
+    'json_loads',
+    'JSONDecodeError',
+    'ORJSON_AVAILABLE'
 ]
\ No newline at end of file
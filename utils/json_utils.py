@@ -0,0 +1,33 @@
+"""
+JSON helpers for Pans Cookbook application.
+
+Uses orjson when it is installed (several times faster for both directions)
+and falls back to the standard library json module otherwise.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string for database storage"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Deserialize a JSON string (or bytes) read from the database"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)